@@ -0,0 +1,59 @@
+# cocotb_bench.py: Benchmark of the MFBDriver send modes
+# Copyright (C) 2024 CESNET z. s. p. o.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Run with: make COCOTB_MODULE=cocotb_bench
+
+import time
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, ClockCycles
+from cocotbext.ofm.mfb.drivers import MFBDriver
+from cocotbext.ofm.mfb.monitors import MFBMonitor
+from cocotbext.ofm.ver.generators import random_packets
+from cocotb_bus.scoreboard import Scoreboard
+
+
+async def run_bench(dut, word_packing, pkt_count, frame_size_min, frame_size_max):
+    """Sends frames without backpressure and logs how many frames per second of wall-clock time were sent."""
+    stream_in = MFBDriver(dut, "RX", dut.CLK, word_packing=word_packing)
+    stream_out = MFBMonitor(dut, "TX", dut.CLK)
+    expected_output = []
+    scoreboard = Scoreboard(dut)
+    scoreboard.add_interface(stream_out, expected_output)
+
+    dut.TX_DST_RDY.value = 1
+    dut.RST.value = 1
+    await ClockCycles(dut.CLK, 2)
+    dut.RST.value = 0
+    await RisingEdge(dut.CLK)
+
+    frames = list(random_packets(frame_size_min, frame_size_max, pkt_count))
+    expected_output.extend(frames)
+
+    start = time.perf_counter()
+    for transaction in frames:
+        stream_in.append(transaction)
+
+    while stream_out.frame_cnt < pkt_count:
+        await ClockCycles(dut.CLK, 100)
+    elapsed = time.perf_counter() - start
+
+    mode = "word packing" if word_packing else "block by block"
+    cocotb.log.info(f"MFBDriver ({mode}): {pkt_count} frames in {elapsed:.3f} s, {pkt_count / elapsed:,.1f} frames/s")
+
+    raise scoreboard.result
+
+
+@cocotb.test()
+async def bench_block_mode(dut, pkt_count=10000, frame_size_min=60, frame_size_max=1500):
+    cocotb.start_soon(Clock(dut.CLK, 5, units="ns").start())
+    await run_bench(dut, False, pkt_count, frame_size_min, frame_size_max)
+
+
+@cocotb.test()
+async def bench_word_packing(dut, pkt_count=10000, frame_size_min=60, frame_size_max=1500):
+    cocotb.start_soon(Clock(dut.CLK, 5, units="ns").start())
+    await run_bench(dut, True, pkt_count, frame_size_min, frame_size_max)
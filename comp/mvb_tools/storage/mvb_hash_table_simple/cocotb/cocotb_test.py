@@ -22,10 +22,10 @@ from drivers import MVB_HASH_TABLE_SIMPLE_Driver as MVBDriver
 from monitors import MVB_HASH_TABLE_SIMPLE_Monitor as MVBMonitor
 from cocotbext.ofm.ver.generators import random_packets
 from cocotb_bus.drivers import BitDriver
-from cocotb_bus.scoreboard import Scoreboard
+from cocotbext.ofm.ver.scoreboard import StreamScoreboard
 
 import nfb
-from sw.toolkit import MVB_HASH_TABLE_SIMPLE_TOOLKIT, toeplitz_hash, simple_xor_hash
+from sw.toolkit import MVB_HASH_TABLE_SIMPLE_TOOLKIT, hash_engine
 from cocotbext.ofm.utils.servicer import Servicer
 from cocotbext.ofm.utils.device import get_dtb
 from cocotbext.ofm.utils.math import ceildiv
@@ -65,9 +65,8 @@ class testbench():
 
         # Create a scoreboard on the stream_out bus
         self.pkts_sent = 0
-        self.expected_output = []
-        self.scoreboard = Scoreboard(dut)
-        self.scoreboard.add_interface(self.stream_out, self.expected_output)
+        self.scoreboard = StreamScoreboard(dut)
+        self.expected_output = self.scoreboard.add_interface(self.stream_out)
 
         if debug:
             self.stream_in.log.setLevel(cocotb.logging.DEBUG)
@@ -92,7 +91,6 @@ class testbench():
         out_keys = list()
         out_data = dict()
         tables = ["TOEPLITZ", "SIMPLE_XOR"]
-        hash_functions = {"TOEPLITZ": toeplitz_hash, "SIMPLE_XOR": simple_xor_hash}
 
         fp = open(path, 'r')
 
@@ -100,11 +98,14 @@ class testbench():
         comp_conf = yaml_data["mvb_hash_table_simple"]
 
         params["hash_key"] = comp_conf["hash_key"]
+        engine = hash_engine(params)
+        hash_functions = {"TOEPLITZ": engine.toeplitz, "SIMPLE_XOR": engine.simple_xor}
 
         for i in range(comp_conf["num_of_tables"]):
             table = list()
 
             table_raw_data = comp_conf[tables[i]]
+            hashes = hash_functions[tables[i]]([r["record"]["mvb_key"] for r in table_raw_data])
 
             for j in range(len(table_raw_data)):
                 record = table_raw_data[j]["record"]
@@ -112,7 +113,7 @@ class testbench():
                 mvb_key = record["mvb_key"]
                 data = record["data"]
 
-                h = hash_functions[tables[i]](mvb_key, params)
+                h = int(hashes[j])
 
                 out_keys.append(mvb_key)
                 out_data[mvb_key] = data
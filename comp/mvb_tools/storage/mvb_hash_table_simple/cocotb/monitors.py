@@ -17,6 +17,6 @@ class MVB_HASH_TABLE_SIMPLE_Monitor(MVBMonitor):
         self.log.debug(f"MATCH: {match_val}")
 
         if match_val[offset] == 1:
-            self._recv((data[offset*self._item_width:(offset+1)*self._item_width], 1))
+            self._recv((bytes(data[offset*self._item_width:(offset+1)*self._item_width]), 1))
         else:
             self._recv((self._item_width * b'\x00', 0))
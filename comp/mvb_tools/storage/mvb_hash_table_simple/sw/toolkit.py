@@ -23,10 +23,13 @@ Arguments:
 """
 
 import nfb
-from cocotb.types import LogicArray, Range
 from cocotbext.ofm.utils.math import ceildiv
 import colorama
+import numpy as np
+import random
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from math import log2
 import yaml
 
@@ -113,6 +116,7 @@ class MVB_HASH_TABLE_SIMPLE_TOOLKIT(nfb.BaseComp):
             "hash": self.comm_hash,
             "testkey": self.comm_testkey,
             "comparehashes": self.comm_comparehashes,
+            "optimizekey": self.comm_optimizekey,
             "hwconfig": self.comm_hwconfig,
             "help": self.comm_help
         }
@@ -198,18 +202,9 @@ class MVB_HASH_TABLE_SIMPLE_TOOLKIT(nfb.BaseComp):
 
         """
 
-        hashes = list()
-        collisions = 0
+        hashes = hash_engine(self.hash_func_params).vectorize(hash_function)(range(self.table_capacity))
 
-        for i in range(self.table_capacity):
-            h = hash_function(i, self.hash_func_params)
-
-            if h in hashes:
-                collisions += 1
-            else:
-                hashes.append(h)
-
-        return collisions
+        return self.table_capacity - len(np.unique(hashes))
 
     def test_collisions(self, hash_function1, hash_function2) -> list:
         """Tests collisions between two different hash functions, where collision is a situation, where for the same key both
@@ -223,13 +218,94 @@ class MVB_HASH_TABLE_SIMPLE_TOOLKIT(nfb.BaseComp):
 
         """
 
-        collisions = list()
+        engine = hash_engine(self.hash_func_params)
+        keys = engine.key_bytes(range(self.table_capacity))
+        hashes1 = engine.vectorize(hash_function1)(keys)
+        hashes2 = engine.vectorize(hash_function2)(keys)
 
-        for i in range(self.table_capacity):
-            if hash_function1(i, self.hash_func_params) == hash_function2(i, self.hash_func_params):
-                collisions.append(f"{i} -> {hash_function1(i, self.hash_func_params)}")
+        return [f"{i} -> {hashes1[i]}" for i in np.flatnonzero(hashes1 == hashes2)]
 
-        return collisions
+    def optimize_key(self, mvb_keys, restarts: int = 16, workers: int = None, seed: int = None, max_passes: int = 16) -> (int, int):
+        """Searches for the toeplitz hash key with the fewest colliding inserts of the MVB keys across both tables.
+
+        Each restart starts from a random hash key (the first one from the current hash key) and flips its bits one by one,
+        keeping the flips which decrease the number of colliding inserts, until a whole pass over the bits brings no improvement.
+        Restarts run in parallel on a process pool.
+
+        Args:
+            mvb_keys: MVB keys in the order of insertion.
+            restarts: number of the random restarts.
+            workers: number of processes, number of CPUs by default. With 1, the search runs in this process.
+            seed: seed of the random hash keys.
+            max_passes: maximal number of passes over the bits of the hash key in one restart.
+
+        Returns:
+            The best hash key and its number of colliding inserts.
+
+        """
+
+        engine = hash_engine(self.hash_func_params)
+        kb = engine.key_bytes(mvb_keys)
+        rng = random.Random(seed)
+
+        jobs = [
+            (self.hash_func_params, self.num_of_tables, kb, self.hash_key if i == 0 else rng.getrandbits(self.hash_key_width), rng.getrandbits(64), max_passes)
+            for i in range(restarts)
+        ]
+
+        if workers == 1:
+            results = [_optimize_key_restart(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_optimize_key_restart, *zip(*jobs)))
+
+        collisions, hash_key = min(results)
+        return hash_key, collisions
+
+    def set_hash_key(self, hash_key: int) -> list:
+        """Sets the hash key and inserts all records into the tables again, because their positions change.
+
+        Args:
+            hash_key: the new hash key.
+
+        Returns:
+            List of MVB keys of the records, which couldn't be inserted.
+
+        """
+
+        params = [self.t_params, self.x_params]
+        records = list()
+
+        for i in range(self.num_of_tables):
+            hash_function, keys, hash_table, used = params[i][1:5]
+            hashes = hash_engine(self.hash_func_params).vectorize(hash_function)(keys[:used])
+            records += [(keys[j], hash_table[int(hashes[j])][1]) for j in range(used)]
+
+        self.hash_key = hash_key
+        self.hash_func_params["hash_key"] = hash_key
+
+        engine = hash_engine(self.hash_func_params)
+        kb = engine.key_bytes([r[0] for r in records])
+        hashes = [engine.toeplitz(kb), engine.simple_xor(kb)]
+        rejected = list()
+
+        for i in range(self.num_of_tables):
+            params[i][2].clear()
+            params[i][3] = [[False, 0] for _ in range(self.table_capacity)]
+            params[i][4] = 0
+
+        for j, (key, data) in enumerate(records):
+            for i in range(self.num_of_tables):
+                h = int(hashes[i][j])
+                if params[i][3][h][0] is False:
+                    params[i][2].append(key)
+                    params[i][3][h] = [True, data]
+                    params[i][4] += 1
+                    break
+            else:
+                rejected.append(key)
+
+        return rejected
 
     def command_line(self) -> None:
         """Main interface of the interactive mode used to input commands. Runs until the 'exit' or 'quit' commands.
@@ -355,8 +431,10 @@ class MVB_HASH_TABLE_SIMPLE_TOOLKIT(nfb.BaseComp):
                     print("No records.\n")
                     continue
 
+                hashes = hash_engine(self.hash_func_params).vectorize(hash_function)(keys[:used])
+
                 for j in range(used):
-                    hash_key = hash_function(keys[j], self.hash_func_params)
+                    hash_key = int(hashes[j])
                     print(f"\n{colorama.Fore.BLUE  + colorama.Style.BRIGHT}RECORD {j}:{colorama.Style.RESET_ALL}\n\tPOSITION = {hash_key}\n\tKEY = {keys[j]}\n\tDATA = {hash_table[hash_key][1]}")
 
                 print(f"\n {colorama.Fore.BLUE  + colorama.Style.BRIGHT}{used} used, {self.table_capacity - used} free.{colorama.Style.RESET_ALL}\n")
@@ -558,9 +636,10 @@ class MVB_HASH_TABLE_SIMPLE_TOOLKIT(nfb.BaseComp):
 
             # name = params[i][0]
             hash_function, keys, hash_table, used = params[i][1:5]
+            hashes = hash_engine(self.hash_func_params).vectorize(hash_function)(keys)
 
             for j in range(len(keys)):
-                hash_key = hash_function(keys[j], self.hash_func_params)
+                hash_key = int(hashes[j])
                 address_bytes = hash_key.to_bytes(self.mvb_key_width // 8, 'little')
                 data_bytes = ((int(keys[j]) << (self.data_out_width + 1)) + (hash_table[hash_key][1] << 1) + 1).to_bytes((self.mvb_key_width // 8) + (self.data_out_width // 8) + 1, 'little')
 
@@ -611,11 +690,12 @@ class MVB_HASH_TABLE_SIMPLE_TOOLKIT(nfb.BaseComp):
             used = params[i][4]
 
             yaml_hash_table = comp_conf[name] = list()
+            hashes = hash_engine(self.hash_func_params).vectorize(hash_function)(keys[:used])
 
             for j in range(used):
                 record_wrap = dict()
                 record = dict()
-                h = hash_function(keys[j], self.hash_func_params)
+                h = int(hashes[j])
 
                 record_wrap["record"] = record
 
@@ -776,10 +856,54 @@ class MVB_HASH_TABLE_SIMPLE_TOOLKIT(nfb.BaseComp):
 
         print(f"Number of collisions: {len(collisions)}")
 
+    def comm_optimizekey(self, path: str = None, restarts: int = 16, workers: int = None, silent: bool = False) -> None:
+        """Searches for the hash key with the fewest colliding inserts of the MVB keys and optionally sets it.
+
+        Args:
+            path: text file with one MVB key per line in the order of insertion. Keys of the current records are used by default.
+            restarts: number of the random restarts of the search.
+            workers: number of processes, number of CPUs by default.
+            silent: if True, cancels print-outs and sets the found key without asking.
+
+        """
+
+        if path is None:
+            mvb_keys = self.t_keys + self.x_keys
+        else:
+            try:
+                with open(path, 'r') as fp:
+                    mvb_keys = [int(line, 0) for line in fp if line.strip()]
+            except Exception:
+                print(f"{colorama.Fore.RED}Error:{colorama.Style.RESET_ALL} Failed to read MVB keys from file {path}.")
+                return
+
+        if len(mvb_keys) == 0:
+            print(f"{colorama.Fore.RED}Error:{colorama.Style.RESET_ALL} No MVB keys. Usage of optimizekey: optimizekey (path=[*current records]) (restarts=16) (workers=[*number of CPUs]).")
+            return
+
+        engine = hash_engine(self.hash_func_params)
+        current = engine.insert_collisions(mvb_keys, num_of_tables=self.num_of_tables)
+        hash_key, collisions = self.optimize_key(mvb_keys, restarts, workers)
+
+        if not silent:
+            print(f"Current hash key {self.hash_key}: {current} colliding inserts of {len(mvb_keys)} MVB keys.")
+            print(f"Found hash key {hash_key}: {collisions} colliding inserts of {len(mvb_keys)} MVB keys.")
+
+        if hash_key == self.hash_key:
+            return
+
+        if silent or input("Use the found hash key? (y/n) ") == "y":
+            rejected = self.set_hash_key(hash_key)
+
+            if not silent:
+                if rejected:
+                    print(f"{colorama.Fore.RED}Warning:{colorama.Style.RESET_ALL} Records with keys {rejected} can't be added with the new hash key and were removed.")
+                print(f"{colorama.Fore.GREEN}Success:{colorama.Style.RESET_ALL} Hash key set to {hash_key}.")
+
     def comm_help(self) -> None:
         """Prints out help."""
 
-        print(f"\nThis script is used for creating, editing and applying configuration files for MVB_HASH_TABLE_SIMPLE component.\n\n{colorama.Fore.BLUE + colorama.Style.BRIGHT}Commands:{colorama.Style.RESET_ALL}\n\tadd (key) (data) (table=[*toeplitz, xor]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- creates new record{colorama.Style.RESET_ALL}\n\tlist (mode=[records, table]) (table=[*both, toeplitz, xor]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- lists records or hash table{colorama.Style.RESET_ALL}\n\treplace (table=[toeplitz, xor]) (record_num) (key) (data) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- replaces data in specified record with specified data{colorama.Style.RESET_ALL}\n\tremove (mode=[record, hash]) (table=[toeplitz, xor]) (num) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- removes record by record number or hash number{colorama.Style.RESET_ALL}\n\tclear (table=[toeplitz, xor]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- deletes all records in specified table{colorama.Style.RESET_ALL}\n\tsave (path) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- save configuration into a file{colorama.Style.RESET_ALL}\n\tload (path) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- loads configuration from a file{colorama.Style.RESET_ALL}\n\thwconfig {colorama.Fore.BLUE + colorama.Style.BRIGHT}- displays configuration of the connected component{colorama.Style.RESET_ALL}\n\tcommit {colorama.Fore.BLUE + colorama.Style.BRIGHT}- uploads configuration to component{colorama.Style.RESET_ALL}\n\thash (hash_function=[toeplitz, xor]) (num) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- calculates hash of specified number using specified hash function (debug){colorama.Style.RESET_ALL}\n\ttestkey (hash_function=[toeplitz, xor]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- tests hash key for collions (debug){colorama.Style.RESET_ALL}\n\tcomparehashes {colorama.Fore.BLUE + colorama.Style.BRIGHT}- test collions between toeplitz and simple xor hash functions (debug){colorama.Style.RESET_ALL}\n")
+        print(f"\nThis script is used for creating, editing and applying configuration files for MVB_HASH_TABLE_SIMPLE component.\n\n{colorama.Fore.BLUE + colorama.Style.BRIGHT}Commands:{colorama.Style.RESET_ALL}\n\tadd (key) (data) (table=[*toeplitz, xor]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- creates new record{colorama.Style.RESET_ALL}\n\tlist (mode=[records, table]) (table=[*both, toeplitz, xor]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- lists records or hash table{colorama.Style.RESET_ALL}\n\treplace (table=[toeplitz, xor]) (record_num) (key) (data) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- replaces data in specified record with specified data{colorama.Style.RESET_ALL}\n\tremove (mode=[record, hash]) (table=[toeplitz, xor]) (num) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- removes record by record number or hash number{colorama.Style.RESET_ALL}\n\tclear (table=[toeplitz, xor]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- deletes all records in specified table{colorama.Style.RESET_ALL}\n\tsave (path) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- save configuration into a file{colorama.Style.RESET_ALL}\n\tload (path) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- loads configuration from a file{colorama.Style.RESET_ALL}\n\thwconfig {colorama.Fore.BLUE + colorama.Style.BRIGHT}- displays configuration of the connected component{colorama.Style.RESET_ALL}\n\tcommit {colorama.Fore.BLUE + colorama.Style.BRIGHT}- uploads configuration to component{colorama.Style.RESET_ALL}\n\thash (hash_function=[toeplitz, xor]) (num) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- calculates hash of specified number using specified hash function (debug){colorama.Style.RESET_ALL}\n\ttestkey (hash_function=[toeplitz, xor]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- tests hash key for collions (debug){colorama.Style.RESET_ALL}\n\tcomparehashes {colorama.Fore.BLUE + colorama.Style.BRIGHT}- test collions between toeplitz and simple xor hash functions (debug){colorama.Style.RESET_ALL}\n\toptimizekey (path=[*current records]) (restarts=16) (workers=[*number of CPUs]) {colorama.Fore.BLUE + colorama.Style.BRIGHT}- searches for the hash key with the fewest collisions of the MVB keys{colorama.Style.RESET_ALL}\n")
 
     def error(self) -> None:
         """Prints out generic error."""
@@ -787,6 +911,172 @@ class MVB_HASH_TABLE_SIMPLE_TOOLKIT(nfb.BaseComp):
         print(f"{colorama.Fore.RED}Error:{colorama.Style.RESET_ALL} Invalid command or arguments. Use command 'help' to view usage.")
 
 
+class HashEngine:
+    """Vectorized toeplitz and simple xor hash functions, which calculate hashes of whole arrays of MVB keys at once.
+
+    The toeplitz hash of a key is XOR of the hash key slices selected by the set bits of the key. The XOR of the slices
+    is precomputed for all 256 values of each byte of the key, so the hash is XOR of one table lookup per key byte.
+
+    Atributes:
+        hash_key, mvb_key_width, hash_key_width, hash_width: configuration parametres of the hash functions.
+        _key_bytes(int): number of bytes of the MVB key.
+        _tables(np.ndarray): XOR of the hash key slices for each byte of the key and its value, shape (_key_bytes, 256).
+
+    """
+
+    def __init__(self, hash_key: int, mvb_key_width: int, hash_key_width: int, hash_width: int) -> None:
+        if hash_key_width < mvb_key_width + hash_width - 1:
+            raise ValueError(f"Hash key of {hash_key_width} bits is too short for {mvb_key_width} bit MVB key and {hash_width} bit hash.")
+
+        self.hash_key = hash_key
+        self.mvb_key_width = mvb_key_width
+        self.hash_key_width = hash_key_width
+        self.hash_width = hash_width
+
+        self._key_bytes = ceildiv(8, mvb_key_width)
+        self._mask = (1 << hash_width) - 1
+        self._tables = self.toeplitz_tables(hash_key)
+
+    def toeplitz_tables(self, hash_key: int) -> np.ndarray:
+        """Returns lookup tables of the toeplitz hash for the hash_key (used by the key search for candidate keys)."""
+
+        tables = np.zeros((self._key_bytes, 256), dtype=np.uint64)
+
+        for b in range(self._key_bytes):
+            table = np.zeros(1, dtype=np.uint64)
+
+            for i in range(8 * b, 8 * (b + 1)):
+                # Bit i of the MVB key selects the slice (hash_key_width-1-j downto hash_key_width-hash_width-j), j = mvb_key_width-1-i
+                key_slice = (hash_key >> (self.hash_key_width - self.hash_width - (self.mvb_key_width - 1 - i))) & self._mask if i < self.mvb_key_width else 0
+                table = np.concatenate((table, table ^ np.uint64(key_slice)))
+
+            tables[b] = table
+
+        return tables
+
+    def key_bytes(self, mvb_keys) -> np.ndarray:
+        """Returns MVB keys (iterable of integers or NumPy integer array) as matrix of their little endian bytes."""
+
+        if isinstance(mvb_keys, range):
+            mvb_keys = np.arange(mvb_keys.start, mvb_keys.stop, mvb_keys.step, dtype=np.uint64)
+
+        if isinstance(mvb_keys, np.ndarray) and self._key_bytes <= 8:
+            return mvb_keys.astype("<u8").view(np.uint8).reshape(-1, 8)[:, :self._key_bytes]
+
+        data = b"".join(int(k).to_bytes(self._key_bytes, 'little') for k in mvb_keys)
+        return np.frombuffer(data, dtype=np.uint8).reshape(-1, self._key_bytes)
+
+    def toeplitz(self, mvb_keys, tables: np.ndarray = None) -> np.ndarray:
+        """Calculates toeplitz hashes of the MVB keys (or of the key bytes matrix returned by key_bytes).
+
+        Args:
+            mvb_keys: iterable of integers, NumPy integer array or matrix of the key bytes.
+            tables: lookup tables of a different hash key returned by toeplitz_tables.
+
+        Returns:
+            Array of the hashes.
+
+        """
+
+        kb = mvb_keys if isinstance(mvb_keys, np.ndarray) and mvb_keys.ndim == 2 else self.key_bytes(mvb_keys)
+        tables = self._tables if tables is None else tables
+
+        hashes = np.zeros(len(kb), dtype=np.uint64)
+        for b in range(self._key_bytes):
+            hashes ^= tables[b][kb[:, b]]
+
+        return hashes
+
+    def simple_xor(self, mvb_keys, hash_key: int = None) -> np.ndarray:
+        """Calculates simple xor hashes of the MVB keys (or of the key bytes matrix returned by key_bytes)."""
+
+        kb = mvb_keys if isinstance(mvb_keys, np.ndarray) and mvb_keys.ndim == 2 else self.key_bytes(mvb_keys)
+        hash_key = self.hash_key if hash_key is None else hash_key
+
+        # The hash has at most 64 bits, so only the low 8 bytes of the key are needed
+        low = np.zeros(len(kb), dtype=np.uint64)
+        for b in range(min(8, self._key_bytes)):
+            low |= kb[:, b].astype(np.uint64) << np.uint64(8 * b)
+
+        return (low ^ np.uint64(hash_key & 0xFFFFFFFFFFFFFFFF)) & np.uint64(self._mask)
+
+    def insert_collisions(self, mvb_keys, hash_key: int = None, num_of_tables: int = 2) -> int:
+        """Counts inserts colliding with an occupied position, when the MVB keys are inserted in order into empty tables.
+
+        Each key is inserted into the toeplitz table, on collision into the simple xor table (like the add command).
+        Inserts colliding in both tables are counted twice, they are rejected.
+
+        Args:
+            mvb_keys: MVB keys (see toeplitz), the matrix of the key bytes is the fastest for repeated calls.
+            hash_key: candidate hash key, the hash key of the engine by default.
+            num_of_tables: number of tables of the component.
+
+        Returns:
+            Number of colliding inserts.
+
+        """
+
+        kb = mvb_keys if isinstance(mvb_keys, np.ndarray) and mvb_keys.ndim == 2 else self.key_bytes(mvb_keys)
+        tables = None if hash_key is None else self.toeplitz_tables(hash_key)
+
+        t_hashes = self.toeplitz(kb, tables)
+        _, placed = np.unique(t_hashes, return_index=True)
+        collisions = len(kb) - len(placed)
+
+        if num_of_tables > 1 and collisions:
+            redirected = np.ones(len(kb), dtype=bool)
+            redirected[placed] = False
+            x_hashes = self.simple_xor(kb[redirected], hash_key)
+            collisions += len(x_hashes) - len(np.unique(x_hashes))
+
+        return collisions
+
+    def vectorize(self, hash_function):
+        """Returns vectorized version of the toeplitz_hash or simple_xor_hash function."""
+
+        return {toeplitz_hash: self.toeplitz, simple_xor_hash: self.simple_xor}[hash_function]
+
+
+@lru_cache(maxsize=16)
+def _hash_engine(hash_key: int, mvb_key_width: int, hash_key_width: int, hash_width: int) -> HashEngine:
+    return HashEngine(hash_key, mvb_key_width, hash_key_width, hash_width)
+
+
+def hash_engine(params: dict) -> HashEngine:
+    """Returns (cached) hash engine for the parametres of the component (hash_key, mvb_key_width, hash_key_width, hash_width)."""
+
+    return _hash_engine(params["hash_key"], params["mvb_key_width"], params["hash_key_width"], params["hash_width"])
+
+
+def _optimize_key_restart(params: dict, num_of_tables: int, key_bytes: np.ndarray, hash_key: int, seed: int, max_passes: int) -> (int, int):
+    """One restart of the hash key search (run in a worker process), returns number of colliding inserts and the hash key."""
+
+    engine = hash_engine(params)
+    rng = random.Random(seed)
+    bits = list(range(engine.hash_key_width))
+    collisions = engine.insert_collisions(key_bytes, hash_key, num_of_tables)
+
+    for _ in range(max_passes):
+        improved = False
+        rng.shuffle(bits)
+
+        for bit in bits:
+            if collisions == 0:
+                return collisions, hash_key
+
+            candidate = hash_key ^ (1 << bit)
+            candidate_collisions = engine.insert_collisions(key_bytes, candidate, num_of_tables)
+
+            if candidate_collisions < collisions:
+                hash_key, collisions = candidate, candidate_collisions
+                improved = True
+
+        if not improved:
+            break
+
+    return collisions, hash_key
+
+
 def toeplitz_hash(mvb_key: int, params: dict) -> int:
     """Calculates hash using the toeplitz hash function.
 
@@ -799,25 +1089,7 @@ def toeplitz_hash(mvb_key: int, params: dict) -> int:
 
     """
 
-    hash_key = params["hash_key"]
-    mvb_key_width = params["mvb_key_width"]
-    hash_key_width = params["hash_key_width"]
-    hash_width = params["hash_width"]
-
-    hash_key_bits = LogicArray(hash_key, Range(hash_key_width-1, 'downto', 0))
-    mvb_key_bits = LogicArray(mvb_key, Range(mvb_key_width-1, 'downto', 0))
-    hash_bits = LogicArray(0, Range(hash_width-1, 'downto', 0))
-
-    for i in Range(mvb_key_width-1, 'downto', 0):
-        key_slice = hash_key_bits[hash_key_width-(mvb_key_width-1-i)-1 : hash_key_width-hash_width-(mvb_key_width-1-i)]
-        key_hash = LogicArray(0, Range(hash_width-1, 'downto', 0))
-
-        if mvb_key_bits[i]:
-            key_hash = key_slice
-
-        hash_bits = hash_bits ^ key_hash
-
-    return hash_bits.integer
+    return int(hash_engine(params).toeplitz([mvb_key])[0])
 
 
 def simple_xor_hash(mvb_key: int, params: dict) -> int:
@@ -832,17 +1104,7 @@ def simple_xor_hash(mvb_key: int, params: dict) -> int:
 
     """
 
-    hash_key = params["hash_key"]
-    mvb_key_width = params["mvb_key_width"]
-    hash_key_width = params["hash_key_width"]
-    hash_width = params["hash_width"]
-
-    hash_key_bits = LogicArray(hash_key, Range(hash_key_width, 'downto', 0))
-    mvb_key_bits = LogicArray(mvb_key, Range(mvb_key_width, 'downto', 0))
-
-    hash_bits = mvb_key_bits[hash_width-1 : 0] ^ hash_key_bits[hash_width-1 : 0]
-
-    return hash_bits.integer
+    return int(hash_engine(params).simple_xor([mvb_key])[0])
 
 
 def main() -> None:
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# pcie_requester.py: Benchmark of the Axi4SRequester transaction processing
+# Copyright (C) 2024 CESNET z. s. p. o.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Compares the byte buffer and the integer path of the Axi4SRequester. Transactions are processed
+# without simulator: RQ words are passed directly to the monitor callback and RC words are only
+# generated, so the result is the simulated DMA throughput per second of CPU time.
+#
+# Run with: python3 pcie_requester.py [--count N] [--size BYTES]
+
+import argparse
+import random
+import time
+from unittest import mock
+
+from cocotbext.ofm.pcie.Axi4SRequester import Axi4SRequester, RequestHeader, RqUser
+from cocotbext.ofm.utils import RAM
+
+
+WIDTH = 512
+
+
+class Signal:
+    def __len__(self):
+        return WIDTH
+
+
+class Bus:
+    TDATA = Signal()
+
+
+class Agent:
+    bus = Bus()
+
+    def add_callback(self, callback):
+        pass
+
+
+def rq_words(addr, size, req_type, tag=0):
+    """Returns list of RQ interface words (as passed by the Axi4Stream monitor) with one request."""
+    header = RequestHeader()
+    header.addr = addr >> 2
+    header.dword_count = size // 4
+    header.type = req_type
+    header.tag = tag
+
+    data = header.to_bytes()
+    if req_type == 1:
+        data += random.randbytes(size)
+
+    width = WIDTH // 8
+    words = []
+    for pos in range(0, len(data), width):
+        user = RqUser()
+        user.first_be0 = 0xF
+        user.last_be0 = 0xF
+        if pos == 0:
+            user.sop = 1
+        if pos + width >= len(data):
+            user.eop = 1
+            user.eop0 = (len(data) - pos) // 4 - 1
+
+        word = data[pos:pos + width].ljust(width, b"\0")
+        words.append({
+            "TDATA": word[::-1],
+            "TUSER": user.to_bytes(byteorder="big"),
+        })
+    return words
+
+
+def run(byte_buffers, writes, reads, ram_size):
+    # The response coroutine needs the simulator, completions are generated directly
+    with mock.patch("cocotb.start_soon", side_effect=lambda coro: coro.close()):
+        req = Axi4SRequester(RAM(ram_size), Agent(), Agent(), Agent(), byte_buffers=byte_buffers)
+
+    completions = []
+    start = time.process_time()
+    for word in writes:
+        req.handle_rq_transaction(word)
+    t_write = time.process_time() - start
+
+    start = time.process_time()
+    for word in reads:
+        req.handle_rq_transaction(word)
+    while not req._q.empty():
+        completions.append(req.completion_words(*req._q.get_nowait()))
+    t_read = time.process_time() - start
+
+    return req._ram._mem, completions, t_write, t_read
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000, help="number of write and read requests")
+    parser.add_argument("--size", type=int, default=256, help="request size in bytes")
+    args = parser.parse_args()
+
+    ram_size = 2**24
+    random.seed(0)
+    addrs = [random.randrange(0, ram_size - args.size, 4) for _ in range(args.count)]
+    writes = [w for addr in addrs for w in rq_words(addr, args.size, 1)]
+    reads = [w for tag, addr in enumerate(addrs) for w in rq_words(addr, args.size, 0, tag % 256)]
+
+    gbytes = args.count * args.size / 1e9
+    results = {}
+    for name, byte_buffers in [("integer", False), ("byte buffers", True)]:
+        results[name] = run(byte_buffers, writes, reads, ram_size)
+        _, _, t_write, t_read = results[name]
+        print(f"{name:>12}: DMA write {gbytes / t_write:.3f} GB/CPU s, DMA read {gbytes / t_read:.3f} GB/CPU s")
+
+    assert results["integer"][:2] == results["byte buffers"][:2], "paths differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
 from .servicer import Servicer
+from .batch import BatchClient, BatchServer
 
-__all__ = ['Servicer']
+__all__ = ['Servicer', 'BatchClient', 'BatchServer']
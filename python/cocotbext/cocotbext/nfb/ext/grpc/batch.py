@@ -0,0 +1,130 @@
+import struct
+from concurrent import futures
+
+import grpc
+
+
+SERVICE = "cocotbext.nfb.BatchExtension"
+
+# Operation: write flag, fdt_offset, offset, nbyte; write operations are followed by nbyte of data
+OP = struct.Struct("<BiiI")
+# Result: status, nbyte; read results are followed by nbyte of data
+RESULT = struct.Struct("<iI")
+
+
+def encode_ops(ops) -> bytes:
+    """Encodes list of (write, fdt_offset, offset, data_or_nbyte) operations into one message.
+
+    Write operations carry the data (bytes), read operations the number of bytes to read.
+    """
+    msg = bytearray()
+    for write, fdt_offset, offset, data in ops:
+        if write:
+            msg += OP.pack(1, fdt_offset, offset, len(data))
+            msg += data
+        else:
+            msg += OP.pack(0, fdt_offset, offset, data)
+    return bytes(msg)
+
+
+def decode_ops(msg: bytes) -> list:
+    """Decodes message created by encode_ops."""
+    ops = []
+    mv = memoryview(msg)
+    pos = 0
+    while pos < len(mv):
+        write, fdt_offset, offset, nbyte = OP.unpack_from(mv, pos)
+        pos += OP.size
+        if write:
+            ops.append((True, fdt_offset, offset, mv[pos: pos + nbyte].tobytes()))
+            pos += nbyte
+        else:
+            ops.append((False, fdt_offset, offset, nbyte))
+    return ops
+
+
+def encode_results(results) -> bytes:
+    """Encodes list of (status, data) results; data is None for write operations."""
+    msg = bytearray()
+    for status, data in results:
+        msg += RESULT.pack(status, len(data) if data is not None else 0)
+        if data is not None:
+            msg += data
+    return bytes(msg)
+
+
+def decode_results(msg: bytes) -> list:
+    """Decodes message created by encode_results into list of (status, data) tuples."""
+    results = []
+    mv = memoryview(msg)
+    pos = 0
+    while pos < len(mv):
+        status, nbyte = RESULT.unpack_from(mv, pos)
+        pos += RESULT.size
+        results.append((status, mv[pos: pos + nbyte].tobytes()))
+        pos += nbyte
+    return results
+
+
+class BatchServer:
+    """gRPC server of the batched component access service.
+
+    The service has two methods, both using raw messages created by encode_ops/encode_results:
+        Access: one batch of operations per call.
+        AccessStream: bidirectional stream, one result message per batch message.
+
+    Calls from concurrent clients are served by a pool of workers threads. Each batch is executed
+    by the servicer as one unit, so the operations of one batch are never interleaved
+    with the operations of other clients.
+    """
+
+    def __init__(self, servicer, host, port, workers=8):
+        self._servicer = servicer
+        handler = grpc.method_handlers_generic_handler(SERVICE, {
+            "Access": grpc.unary_unary_rpc_method_handler(self.Access),
+            "AccessStream": grpc.stream_stream_rpc_method_handler(self.AccessStream),
+        })
+
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+        self._server.add_generic_rpc_handlers((handler,))
+        self._server.add_insecure_port(f"{host}:{port}")
+        self._server.start()
+
+    def stop(self, grace=None):
+        self._server.stop(grace)
+
+    def Access(self, request, context):
+        return encode_results(self._servicer.comp_batch(decode_ops(request)))
+
+    def AccessStream(self, request_iterator, context):
+        for request in request_iterator:
+            yield encode_results(self._servicer.comp_batch(decode_ops(request)))
+
+
+class BatchClient:
+    """Client of the batched component access service.
+
+    Example:
+        client = BatchClient("127.0.0.1", 63240)
+        (status, _), (status, data) = client.access([
+            (True, fdt_offset, 0x00, b"\\x01\\x00\\x00\\x00"),
+            (False, fdt_offset, 0x04, 4),
+        ])
+    """
+
+    def __init__(self, host, port):
+        self._channel = grpc.insecure_channel(f"{host}:{port}")
+        self._access = self._channel.unary_unary(f"/{SERVICE}/Access")
+        self._access_stream = self._channel.stream_stream(f"/{SERVICE}/AccessStream")
+
+    def close(self):
+        self._channel.close()
+
+    def access(self, ops) -> list:
+        """Executes list of (write, fdt_offset, offset, data_or_nbyte) operations, returns list of (status, data)."""
+        return decode_results(self._access(encode_ops(ops)))
+
+    def access_stream(self, batches):
+        """Executes iterable of operation lists over one stream, yields list of results for each batch."""
+        for msg in self._access_stream(encode_ops(ops) for ops in batches):
+            yield decode_results(msg)
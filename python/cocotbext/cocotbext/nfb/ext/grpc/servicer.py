@@ -1,74 +1,68 @@
-import queue
 import logging
 
-import cocotb
-from cocotb.triggers import Timer
-
 import nfb.ext.grpc
 from nfb.ext.grpc import nfb_grpc_pb2_grpc
 from nfb.ext.grpc import nfb_grpc_pb2
 
+from ..servicer import CommonServicer
+from .batch import BatchServer
+
+
+class Servicer(CommonServicer, nfb_grpc_pb2_grpc.NfbExtensionServicer):
+    """gRPC servicer of the libnfb extension.
+
+    Args:
+        batch_addr: optional (host, port) of the batched access service (see BatchServer).
+        batch_workers: number of worker threads serving the batched access service.
+    """
 
-class Servicer(nfb_grpc_pb2_grpc.NfbExtensionServicer):
-    def __init__(self, device, dtb, server_addr=('127.0.0.1', 63239), *args, **kwargs):
+    def __init__(self, device, dtb, server_addr=('127.0.0.1', 63239), *args, batch_addr=None, batch_workers=8, **kwargs):
+        super().__init__(device, dtb, server_addr, *args, **kwargs)
         self._log = logging.getLogger("cocotb.nfb.ext.grpc_servicer")
         self._log.setLevel(5)
-        self._qrx = queue.Queue()
-        self._device = device
-        self._dtb = dtb
         self._server_addr = server_addr
+        self._batch_addr = batch_addr
+        self._batch_workers = batch_workers
+        self._batch_server = None
 
     def start(self):
-        cocotb.start_soon(self._queue_request_handle())
+        super().start()
         self._server = nfb.ext.grpc.Server(self, *self._server_addr)
+        if self._batch_addr is not None:
+            self._batch_server = BatchServer(self, *self._batch_addr, workers=self._batch_workers)
 
     def path(self):
         return f"libnfb-ext-grpc.so:grpc:{self._server_addr[0]}:{self._server_addr[1]}"
 
-    @cocotb.coroutine
-    def _queue_request_handle(self):
-        while True:
-            try:
-                item = self._qrx.get(block=False)
-            except queue.Empty:
-                yield Timer(10, units='ns')
-                continue
-
-            node, offset, write, data, q = item
-            mi_base = node.get_property('reg')[0]
-            mi = self._device.mi[0] # FIXME
-            fn = getattr(mi, 'write' if write else 'read')
-
-            try:
-                d = yield fn(mi_base, data)
-                q.put(d)
-            except Exception:
-                self._log.error("comp access failed")
-                q.put(None)
-
     def GetFdt(self, request, context):
         return nfb_grpc_pb2.FdtResponse(fdt=self._dtb)
 
     def ReadComp(self, request, context):
         data = self._nfb_comp_read(request.fdt_offset, request.nbyte, request.offset)
-        data = [0] * request.nbyte
-        return nfb_grpc_pb2.ReadCompResponse(data=bytes(data), status=0)
+        if data is None:
+            return nfb_grpc_pb2.ReadCompResponse(data=bytes(request.nbyte), status=-1)
+        return nfb_grpc_pb2.ReadCompResponse(data=data, status=0)
 
     def WriteComp(self, request, context):
         self._nfb_comp_write(request.fdt_offset, request.nbyte, request.offset, request.data)
         return nfb_grpc_pb2.WriteCompResponse(status=0)
 
-    def _nfb_comp_write(self, fdtoffset, nbyte, offset, data):
-        node = self._nfb._fdt.get_node(self._nfb.fdt_paths[fdtoffset])
-        self._log.debug(f"comp write: size: {nbyte:>2}, offset: {offset:04x}, path: {node.path}/{node.name}, data:", data)
-        q = queue.Queue()
-        self._qrx.put((node, offset, True, list(data), q))
-        q.get()
+    def comp_batch(self, ops):
+        """Executes list of (write, fdt_offset, offset, data_or_nbyte) operations back-to-back.
+
+        Returns list of (status, data) tuples, data is None for writes.
+        """
+        accesses = []
+        for write, fdt_offset, offset, data in ops:
+            node = self._fdt_node(fdt_offset)
+            accesses.append((node, offset, write, list(data) if write else data))
 
-    def _nfb_comp_read(self, fdtoffset, nbyte, offset):
-        node = self._nfb._fdt.get_node(self._nfb.fdt_paths[fdtoffset])
-        q = queue.Queue()
-        self._qrx.put((node, offset, False, nbyte, q))
-        data = bytes(q.get())
-        self._log.debug(f"comp read: size: {nbyte:>2}, offset: {offset:04x}, path: {node.path}/{node.name}, data:", data)
-        return data
+        results = []
+        for (write, fdt_offset, offset, data), d in zip(ops, self._access_batch(accesses)):
+            if write:
+                results.append((0, None))
+            elif d is None:
+                results.append((-1, bytes(data)))
+            else:
+                results.append((0, bytes(d)))
+        return results
@@ -19,12 +19,9 @@ class Servicer(ext.AbstractNfb):
 
     class NdpQueueRx(NdpQueue, ext.AbstractNdpQueueRx):
         def burst_get(self, count):
-            msg = self._q.recvmsg()
-            if msg is None:
-                return []
-
-            self._burst_temp.append(msg)
-            return [msg]
+            msgs = self._q.recv_burst(count)
+            self._burst_temp += msgs
+            return msgs
 
         def burst_put(self):
             self._burst_temp.clear()
@@ -37,8 +34,7 @@ class Servicer(ext.AbstractNfb):
 
         @cocotb.function
         def burst_put(self):
-            for pkt in self._burst_temp:
-                yield self._q.sendmsg(pkt)
+            yield self._q.sendmsg_burst(self._burst_temp)
             self._burst_temp.clear()
 
     def __init__(self, device, dtb, *args, **kwargs):
@@ -1,8 +1,18 @@
+import functools
 import queue
 import logging
+import threading
+import time
+
+import fdt
+import libfdt
 
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.queue import Queue
+from cocotb.triggers import Event, Timer
+from cocotb.utils import get_sim_time
+
+from ...ofm.utils.histogram import Histogram
 
 
 class CommonAsyncServicer():
@@ -40,48 +50,175 @@ class CommonAsyncServicer():
 
 
 class CommonServicer(CommonAsyncServicer):
+    """Servicer which hands component accesses from other threads to the simulation.
+
+    Accesses are processed by one coroutine: all pending accesses are drained at each wake-up
+    and issued back-to-back on the MI bus. Threads started by the external method wake the coroutine
+    directly. Other threads (e.g. gRPC workers) can't touch the scheduler, their accesses are
+    waited for in a cocotb.external thread, so an access wakes the simulation immediately.
+    The simulation doesn't advance while this thread waits, so after idle_timeout seconds
+    without an access the simulation runs freely and the accesses are polled every poll_period ns
+    until the next one arrives.
+
+    Atributes:
+        poll_period(int): period of the poller for foreign threads in ns, used after idle_timeout.
+        idle_timeout(float): wall-clock time in s, for which the simulation waits for the next access
+                             from foreign threads, None waits until the access arrives.
+        latency_sim(dict): Histogram of simulated time per access in ns, keys are 'read' and 'write'.
+        latency_wall(dict): Histogram of wall-clock time per access in s, keys are 'read' and 'write'.
+        batch_sizes(Histogram): number of accesses processed per wake-up.
+    """
+
     def __init__(self, device, dtb, server_addr=('127.0.0.1', 63239), *args, **kwargs):
         self._log = logging.getLogger("cocotb.nfb.ext.servicer")
         #self._log.setLevel(5)
         self._qrx = queue.Queue()
+        self._requests = Queue()
         self._device = device
         self._dtb = dtb
+        self._fdt = fdt.parse_dtb(dtb)
+        self._libfdt = libfdt.Fdt(dtb)
+        self._fdt_nodes = {}
+        self._external_threads = set()
+        self._handled = Event()
+
+        self.poll_period = 10
+        self.idle_timeout = 1e-3
+        self.latency_sim = {"read": Histogram(), "write": Histogram()}
+        self.latency_wall = {"read": Histogram(bin_width=1e-6), "write": Histogram(bin_width=1e-6)}
+        self.batch_sizes = Histogram()
 
     def start(self):
         cocotb.start_soon(self._queue_request_handle())
+        cocotb.start_soon(self._queue_request_forward())
 
-    @cocotb.coroutine
-    def _queue_request_handle(self):
-        while True:
+    def external(self, func):
+        """Returns cocotb.external of the function, its thread hands the accesses to the simulation directly.
+
+        Use it instead of cocotb.external for the software accessing the components through the servicer.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            ident = threading.get_ident()
+            self._external_threads.add(ident)
             try:
-                item = self._qrx.get(block=False)
-            except queue.Empty:
-                yield Timer(10, units='ns')
-                continue
+                return func(*args, **kwargs)
+            finally:
+                self._external_threads.discard(ident)
 
-            node, offset, write, data, q = item
-            mi_base = node.get_property('reg')[0]
-            mi = self._device.mi[0] # FIXME
-            fn = getattr(mi, 'write' if write else 'read')
+        return cocotb.external(wrapper)
 
-            try:
-                d = yield fn(mi_base, data)
-                q.put(d)
-            except Exception:
-                self._log.error("comp access failed")
-                q.put(None)
+    def _get_foreign(self, timeout):
+        """Returns the next batch from foreign threads, None if none arrives within the timeout (0 doesn't wait)."""
+        try:
+            return self._qrx.get(block=timeout != 0, timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def _queue_request_forward(self):
+        """Forwards batches of accesses from foreign threads into the simulation."""
+        wait = cocotb.external(self._get_foreign)
+        while True:
+            # The simulation is stopped until the access arrives or the idle_timeout elapses
+            item = await wait(self.idle_timeout)
+            while item is None:
+                await Timer(self.poll_period, units='ns')
+                item = self._get_foreign(0)
+
+            self._handled.clear()
+            while item is not None:
+                ops, reply, t_wall = item
+                self._requests.put_nowait((ops, reply, t_wall, get_sim_time("ns")))
+                item = self._get_foreign(0)
+
+            # Don't stop the simulation while the accesses are processed
+            await self._handled.wait()
+
+    async def _queue_request_handle(self):
+        while True:
+            batches = [await self._requests.get()]
+            while not self._requests.empty():
+                batches.append(self._requests.get_nowait())
+
+            self.batch_sizes.add(sum(len(batch[0]) for batch in batches))
+
+            # Each batch is processed as one unit, its accesses are never interleaved with other batches
+            for ops, reply, t_wall, t_sim in batches:
+                reply([await self._process_request(*op, t_wall, t_sim) for op in ops])
+
+            if self._requests.empty():
+                self._handled.set()
+
+    async def _process_request(self, node, offset, write, data, t_wall, t_sim):
+        mi_base = node.get_property('reg')[0]
+        mi = self._device.mi[0] # FIXME
+        fn = getattr(mi, 'write' if write else 'read')
+        kind = 'write' if write else 'read'
+
+        try:
+            d = await fn(mi_base + offset, data)
+        except Exception:
+            self._log.error("comp access failed")
+            d = None
+
+        self.latency_sim[kind].add(get_sim_time("ns") - t_sim)
+        self.latency_wall[kind].add(time.perf_counter() - t_wall)
+        return d
+
+    def _in_external_thread(self):
+        """Returns True if the current thread was started by the external method."""
+        return threading.get_ident() in self._external_threads
+
+    @cocotb.function
+    async def _access_external(self, ops):
+        e = Event()
+        self._requests.put_nowait((ops, e.set, time.perf_counter(), get_sim_time("ns")))
+        await e.wait()
+        return e.data
+
+    def _access(self, node, offset, write, data):
+        return self._access_batch([(node, offset, write, data)])[0]
+
+    def _access_batch(self, ops):
+        """Executes list of (node, offset, write, data) accesses and returns list of their results.
+
+        The accesses are handed to the simulation as one batch, so they are issued back-to-back
+        on the MI bus in the given order, without accesses of other threads in between.
+        """
+        if self._in_external_thread():
+            return self._access_external(ops)
 
-    def _nfb_comp_write(self, fdtoffset, nbyte, offset, data):
-        node = self._nfb._fdt.get_node(self._nfb.fdt_paths[fdtoffset])
-        self._log.debug(f"comp write: size: {nbyte:>2}, offset: {offset:04x}, path: {node.path}/{node.name}, data:", data)
         q = queue.Queue()
-        self._qrx.put((node, offset, True, list(data), q))
-        q.get()
+        self._qrx.put((ops, q.put, time.perf_counter()))
+        return q.get()
+
+    def _fdt_node(self, fdtoffset):
+        """Returns the DeviceTree node at the offset used by the libnfb clients."""
+        node = self._fdt_nodes.get(fdtoffset)
+        if node is None:
+            node = self._fdt.get_node(self._libfdt.get_path(fdtoffset))
+            self._fdt_nodes[fdtoffset] = node
+        return node
+
+    def log_latency(self):
+        """Logs statistics of the component accesses."""
+        for kind in ["read", "write"]:
+            self._log.info(f"comp {kind:<5} latency: sim [ns] {self.latency_sim[kind].summary()}")
+            self._log.info(f"comp {kind:<5} latency: wall [us] {self.latency_wall[kind].summary('{:.1f}', scale=1e6)}")
+        self._log.info(f"accesses per wake-up: {self.batch_sizes.summary()}")
+
+    def _nfb_comp_write(self, fdtoffset, nbyte, offset, data):
+        node = self._fdt_node(fdtoffset)
+        self._log.debug(f"comp write: size: {nbyte:>2}, offset: {offset:04x}, path: {node.path}/{node.name}, data: {bytes(data).hex()}")
+        self._access(node, offset, True, list(data))
 
     def _nfb_comp_read(self, fdtoffset, nbyte, offset):
-        node = self._nfb._fdt.get_node(self._nfb.fdt_paths[fdtoffset])
-        q = queue.Queue()
-        self._qrx.put((node, offset, False, nbyte, q))
-        data = bytes(q.get())
-        self._log.debug(f"comp read: size: {nbyte:>2}, offset: {offset:04x}, path: {node.path}/{node.name}, data:", data)
+        """Returns the read data, None when the access failed."""
+        node = self._fdt_node(fdtoffset)
+        data = self._access(node, offset, False, nbyte)
+        if data is None:
+            self._log.debug(f"comp read: size: {nbyte:>2}, offset: {offset:04x}, path: {node.path}/{node.name}, failed")
+            return None
+        data = bytes(data)
+        self._log.debug(f"comp read: size: {nbyte:>2}, offset: {offset:04x}, path: {node.path}/{node.name}, data: {data.hex()}")
         return data
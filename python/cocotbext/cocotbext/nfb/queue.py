@@ -1,5 +1,8 @@
+import random
+
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.triggers import Event, First, Timer
+from cocotb.utils import get_sim_time
 
 import nfb.libnetcope
 import nfb.libnfb
@@ -36,12 +39,198 @@ class QueueManager:
         for i in index:
             await self.tx[i].flush()
 
+    def stats_summary(self):
+        """Returns multi-line summary of the counters of all queues and their totals."""
+        lines = []
+        for name, queues in [("rx", self.rx), ("tx", self.tx)]:
+            for i, q in enumerate(queues):
+                lines.append(f"{name}{i}: {q.stats}")
+            lines.append(
+                f"{name} total: packets: {sum(q.stats.packets for q in queues)}, "
+                f"bytes: {sum(q.stats.bytes for q in queues)}, "
+                f"stalls: {sum(q.stats.stalls for q in queues)}"
+            )
+        return "\n".join(lines)
+
+
+class TrafficScheduler:
+    """Runs DMA traffic on many queues of the QueueManager concurrently.
+
+    TX queues are served by a weighted round-robin arbiter: each grant is one burst of packets
+    and in each round a queue gets weight grants, so the queues share the bandwidth in the ratio
+    of their weights. Grants of different queues run concurrently, but a queue which used its weight
+    grants isn't granted again until the other queues used theirs. Queues limited by their rate
+    are skipped in the round. A queue stalled in its grant (e.g. waiting for free descriptors)
+    delays the next round only while it has grants left in the current one.
+    Each RX queue is served by its own receiver coroutine.
+
+    Example:
+        sched = TrafficScheduler(dev.dma, seed=1)
+        sched.add_tx(0, 1000, size=(60, 1500), weight=2, callback=expected[0].append)
+        sched.add_tx(1, 1000, size=[(64, 7), (1500, 1)], rate=1e6)
+        sched.add_rx(0, callback=received.append)
+        await sched.run()
+        cocotb.log.info(dev.dma.stats_summary())
+    """
+
+    class _Stream:
+        def __init__(self, queue, **kwargs):
+            self.queue = queue
+            self.busy = False
+            self.next_time = 0
+            self.__dict__.update(kwargs)
+
+    def __init__(self, manager, seed=None):
+        self._manager = manager
+        self._rng = random.Random(seed)
+        self._tx = []
+        self._rx = []
+        self._rx_tasks = []
+        self._granted_done = Event()
+
+    def _size_fn(self, size):
+        if callable(size):
+            return lambda: size(self._rng)
+        if isinstance(size, int):
+            return lambda: size
+        if isinstance(size, tuple):
+            return lambda: self._rng.randint(*size)
+        sizes, weights = zip(*size)
+        return lambda: self._rng.choices(sizes, weights)[0]
+
+    def add_tx(self, index, count, size=(60, 1500), weight=1, rate=None, burst=1, callback=None):
+        """Adds sender of count random packets to the TX queue.
+
+        Args:
+            size: packet size: int, (min, max) tuple for uniform distribution,
+                  list of (size, weight) pairs or callable(random.Random) returning the size.
+            weight: number of grants (bursts) of the queue in one round of the arbiter.
+            rate: maximal rate in packets per second of the simulation time, None for unlimited.
+            burst: number of packets sent with one flush.
+            callback: called with each sent packet, e.g. to fill the expected output of a scoreboard.
+        """
+        self._tx.append(TrafficScheduler._Stream(
+            self._manager.tx[index], remaining=count, size=self._size_fn(size), weight=weight, credits=weight,
+            period=1e9 / rate if rate else 0, burst=burst, callback=callback,
+        ))
+
+    def add_rx(self, index, callback=None, burst=64, descs=128):
+        """Adds receiver to the RX queue.
+
+        Args:
+            callback: called with each received packet.
+            burst: maximal number of packets read at once.
+            descs: number of descriptors kept posted in the ring.
+        """
+        self._rx.append(TrafficScheduler._Stream(self._manager.rx[index], callback=callback, burst=burst, descs=descs))
+
+    async def run(self):
+        """Starts the receivers and returns when all TX packets are sent. Receivers run until stop()."""
+        if not self._rx_tasks:
+            self._rx_tasks = [cocotb.start_soon(self._rx_loop(s)) for s in self._rx]
+
+        while any(s.remaining or s.busy for s in self._tx):
+            self._granted_done.clear()
+            now = get_sim_time("ns")
+            # Start the next round when no queue taking part in this one has grants left
+            if not any(s.credits for s in self._tx if s.remaining and (s.busy or now >= s.next_time)):
+                for s in self._tx:
+                    s.credits = s.weight
+
+            for s in self._tx:
+                if s.remaining and s.credits and not s.busy and now >= s.next_time:
+                    s.credits -= 1
+                    s.busy = True
+                    cocotb.start_soon(self._tx_grant(s))
+
+            triggers = [self._granted_done.wait()]
+            waiting = [s.next_time for s in self._tx if s.remaining and not s.busy]
+            if waiting:
+                # The period of the rate is fractional, round up to the sim precision not to wake before next_time
+                triggers.append(Timer(max(min(waiting) - now, 1), units="ns", round_mode="ceil"))
+            await First(*triggers)
+
+    def stop(self):
+        for task in self._rx_tasks:
+            task.kill()
+        self._rx_tasks = []
+
+    def _packet(self, size):
+        return self._rng.getrandbits(size * 8).to_bytes(size, byteorder="little")
+
+    async def _tx_grant(self, s):
+        pkts = [self._packet(s.size()) for _ in range(min(s.burst, s.remaining))]
+        s.remaining -= len(pkts)
+        if s.callback:
+            for pkt in pkts:
+                s.callback(pkt)
+
+        await s.queue.send_burst(pkts)
+        if s.period:
+            s.next_time = max(s.next_time, get_sim_time("ns")) + s.period * len(pkts)
+
+        s.busy = False
+        self._granted_done.set()
+
+    async def _rx_loop(self, s):
+        q = s.queue
+        await q._push_desc(count=s.descs)
+        while True:
+            q._upd_event.clear()
+            msgs = q.recv_burst(s.burst)
+            if not msgs:
+                await First(q._upd_event.wait(), Timer(q._upd_timeout, units="us"))
+                continue
+
+            if s.callback:
+                for data, hdr, flags in msgs:
+                    s.callback(data)
+            await q._push_desc(count=len(msgs))
+
+
+class QueueStats:
+    """Counters of one queue.
+
+    Atributes:
+        packets(int): number of sent/received packets.
+        bytes(int): number of sent/received bytes.
+        flushes(int): number of pointer flushes to the DMA controller.
+        descs(int): number of descriptors made visible to the DMA controller by the flushes.
+        stalls(int): number of waits for free descriptors in the ring.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.packets = 0
+        self.bytes = 0
+        self.flushes = 0
+        self.descs = 0
+        self.stalls = 0
+        self._start = get_sim_time("ns")
+
+    def packet_rate(self):
+        """Returns number of packets per second of the simulation time since the last clear()."""
+        elapsed = get_sim_time("ns") - self._start
+        return self.packets / (elapsed * 1e-9) if elapsed else 0.0
+
+    def descs_per_flush(self):
+        return self.descs / self.flushes if self.flushes else 0.0
+
+    def __str__(self):
+        return (
+            f"packets: {self.packets}, bytes: {self.bytes}, rate: {self.packet_rate():.0f} pkts/s, "
+            f"descs per flush: {self.descs_per_flush():.1f}, stalls: {self.stalls}"
+        )
+
 
 class QueueNdp:
     def __init__(self, dev, node, buf_index):
         self._ctrl = nfb.libnetcope.DmaCtrlNdp(dev.nfb, node)
         self._ram = dev.ram
         self._state = 0
+        self.stats = QueueStats()
 
         bs = self._buffer_size = 1048576
         self._packet_length_max = 4096
@@ -56,6 +245,11 @@ class QueueNdp:
         self._hdr_base = bb + bs + (bs // 4) * 1 # if self._dir == 0 else 0
         self._upd_base = bb + bs + (bs // 4) * 2
 
+        # Set by each DMA write into the update buffer (new hardware pointers)
+        self._upd_event = Event()
+        self._upd_timeout = 5
+        self._ram.add_write_callback(self._upd_base, 8, self._upd_event.set)
+
     def update_desc_upper_address(self, ba):
         desc = self._ctrl.desc0(ba)
         if self._ctrl.last_upper_addr == desc:
@@ -68,8 +262,28 @@ class QueueNdp:
         self._ctrl.sdp += 1
         self._dsc_free -= 1
 
+    async def _wait_desc_free(self, count):
+        """Waits until at least count descriptors are free in the ring.
+
+        Descriptors pushed but not flushed yet are flushed first, as the controller can't free them otherwise.
+        Then the queue waits for the next update of the hardware pointers (or the fallback timeout in us).
+        """
+        if self._dsc_free >= count:
+            return
+
+        self.stats.stalls += 1
+        while True:
+            self._upd_event.clear()
+            self._dsc_free = (self._ctrl.update_hdp() - (self._ctrl.sdp + 1)) & self._ctrl.mdp
+            if self._dsc_free >= count:
+                return
+
+            if self._ctrl.sdp != self._sdp_hw:
+                await self.flush()
+            await First(self._upd_event.wait(), Timer(self._upd_timeout, units="us"))
+
     async def start(self):
-        upd = memoryview(self._ram._mem)[self._upd_base:self._upd_base + 8]
+        upd = self._ram.view(self._upd_base, 8)
         try:
             await e(self._ctrl.start)(self._dsc_base, self._hdr_base, self._upd_base, upd, self._desc_cnt, self._desc_cnt)
         except Exception:
@@ -77,10 +291,18 @@ class QueueNdp:
             await e(self._ctrl.start)(self._dsc_base, self._hdr_base, self._upd_base, upd, self._desc_cnt, self._desc_cnt)
 
         self._dsc_free = self._ctrl.mdp
+        self._sdp_hw = self._ctrl.sdp
 
         self._npi = 0
         self._state = 1
 
+    async def _flush(self, fn):
+        if self._state == 1:
+            await e(fn)()
+            self.stats.flushes += 1
+            self.stats.descs += (self._ctrl.sdp - self._sdp_hw) & self._ctrl.mdp
+            self._sdp_hw = self._ctrl.sdp
+
     async def read_stats(self):
         return await e(self._ctrl.read_stats)()
 
@@ -90,39 +312,52 @@ class QueueNdpRx(QueueNdp):
         self._dir = 0
         QueueNdp.__init__(self, nfb, node, buf_index)
 
-    async def _push_desc(self, flush=True):
+    async def _push_desc(self, flush=True, count=1):
+        """Posts count descriptors for free packet buffers and flushes them all at once."""
         if self._state == 0:
             await self.start()
 
-        while self._dsc_free < 2:
-            # TODO: check if can be flushed
-            await Timer(10, units="ns")
+        for _ in range(count):
+            await self._wait_desc_free(2)
 
-        ba = self._buffer_base + self._ctrl.sdp * self._packet_length_max
-        self.update_desc_upper_address(ba)
+            ba = self._buffer_base + self._ctrl.sdp * self._packet_length_max
+            self.update_desc_upper_address(ba)
+
+            #desc2 = (2 << 62) | ((self._packet_length_max & 0xFFFF) << 32) | (ba & 0x3FFFFFFF)
+            desc = self._ctrl.desc2(ba, self._packet_length_max, next=False)
+            self._push_one_desc(desc)
 
-        #desc2 = (2 << 62) | ((self._packet_length_max & 0xFFFF) << 32) | (ba & 0x3FFFFFFF)
-        desc = self._ctrl.desc2(ba, self._packet_length_max, next=False)
-        self._push_one_desc(desc)
         if flush:
-            await e(self._ctrl.flush_sp)()
+            await self.flush()
+
+    async def flush(self):
+        await self._flush(self._ctrl.flush_sp)
 
     #async def read(self):
     #    return []
 
     def recv(self, cnt=-1, timeout=0):
-        return [x[0] for x in self.readmsg()]
+        return [x[0] for x in self.recv_burst(cnt)]
 
     def recvmsg(self, cnt=-1, timeout=0):
-        if self._ctrl.shp == self._ctrl.update_hhp():
-            return None
+        msgs = self.recv_burst(1)
+        return msgs[0] if msgs else None
+
+    def recv_burst(self, cnt=-1):
+        """Returns list of up to cnt (all available when negative) received (data, header, flags) messages."""
+        msgs = []
+        hhp = self._ctrl.update_hhp()
+        while self._ctrl.shp != hhp and (cnt < 0 or len(msgs) < cnt):
+            hdr = self._ram.rint(self._hdr_base + 4 * self._ctrl.shp, 4)
+            length = hdr & 0xFFFF
 
-        hdr = self._ram.rint(self._hdr_base + 4 * self._ctrl.shp, 4)
-        length = hdr & 0xFFFF
+            ba = self._buffer_base + self._ctrl.shp * self._packet_length_max
+            self._ctrl.shp += 1
+            msgs.append((bytes(self._ram.r(ba, length)), bytes(), 0))
+            self.stats.bytes += length
 
-        ba = self._buffer_base + self._ctrl.shp * self._packet_length_max
-        self._ctrl.shp += 1
-        return (bytes(self._ram.r(ba, length)), bytes(), 0)
+        self.stats.packets += len(msgs)
+        return msgs
 
 
 class QueueNdpTx(QueueNdp):
@@ -134,39 +369,43 @@ class QueueNdpTx(QueueNdp):
         pass
 
     async def send(self, pkt, flush=True):
-        return self.sendmsg((pkt, [], flush))
+        await self.sendmsg((pkt, bytes(), 0), flush)
 
     async def sendmsg(self, pkt, flush=True):
-        pkt, hdr, flags = pkt
-        pkt_hdr = pkt + hdr
-        assert self._ctrl.mtu[0] <= len(pkt_hdr) <= min(self._packet_length_max, self._ctrl.mtu[1])
+        await self.sendmsg_burst([pkt], flush)
 
+    async def send_burst(self, pkts, flush=True):
+        """Sends list of packets, the descriptors are flushed once for the whole burst."""
+        await self.sendmsg_burst([(pkt, bytes(), 0) for pkt in pkts], flush)
+
+    async def sendmsg_burst(self, msgs, flush=True):
+        """Sends list of (data, header, flags) messages, the descriptors are flushed once for the whole burst."""
         # INFO: may be obsolete, the libnfb.ndp starts it
         if self._state == 0:
             await self.start()
 
-        while self._dsc_free < 2:
-            hdp = self._ctrl.update_hdp()
-            #prev = self._dsc_free
-            self._dsc_free = (hdp - (self._ctrl.sdp + 1)) & self._ctrl.mdp
-            if self._dsc_free < 2:
-                # FIXME: when flush = False, assure that sdp is flushed when
-                #if ((self._sdp_hw - (self._ctrl.sdp + 1))) & self._ctrl.mdp) < 2:
-                #    self.flush()
-                await Timer(5, units="us")
-
-        ba = self._buffer_base + self._npi * self._packet_length_max
-        self.update_desc_upper_address(ba)
-
-        self._ram.w(ba, pkt + hdr)
-        desc = self._ctrl.desc2(ba, len(pkt + hdr), meta=0, next=False, hdr_length=len(hdr))
-        self._push_one_desc(desc)
-        self._npi = (self._npi + 1) % self._packet_count_max
+        mtu_min, mtu_max = self._ctrl.mtu
+        mtu_max = min(self._packet_length_max, mtu_max)
+
+        for pkt, hdr, flags in msgs:
+            pkt_hdr = bytes(pkt) + bytes(hdr)
+            assert mtu_min <= len(pkt_hdr) <= mtu_max
+
+            await self._wait_desc_free(2)
+
+            ba = self._buffer_base + self._npi * self._packet_length_max
+            self.update_desc_upper_address(ba)
+
+            self._ram.w(ba, pkt_hdr)
+            desc = self._ctrl.desc2(ba, len(pkt_hdr), meta=0, next=False, hdr_length=len(hdr))
+            self._push_one_desc(desc)
+            self._npi = (self._npi + 1) % self._packet_count_max
+
+            self.stats.packets += 1
+            self.stats.bytes += len(pkt_hdr)
 
         if flush:
             await self.flush()
 
     async def flush(self):
-        if self._state == 1:
-            await e(self._ctrl.flush_sdp)()
-            self._sdp_hw = self._ctrl.sdp
+        await self._flush(self._ctrl.flush_sdp)
@@ -2,15 +2,26 @@ from typing import Any
 
 from cocotb.triggers import Event
 
-from ..base.drivers import BusDriver
+from ..base.drivers import SegmentedBusDriver, SegmentPacker
 from ..base.transaction import IdleTransaction
 
 
-class AvstEthDriver(BusDriver):
+class AvstEthDriver(SegmentedBusDriver):
+    """
+    Driver of the AVST Ethernet bus.
+
+    Args:
+        packing: enables the segment packing mode, in which the queued packets are planned into whole
+                 words (see SegmentedBusDriver). Packets start at a segment boundary, the valid, sop and eop
+                 signals have one bit per segment (bit 0 for the first segment at the most significant bytes)
+                 and at most one packet ends in a word, as there is one empty signal.
+                 Otherwise, one packet is written per word.
+    """
     _signals = ["data", "valid", "sop", "eop", "empty", "error"]
     # _optional_signals = ["status_valid", "status_data", "pause", "pfc"]
 
-    def __init__(self, entity, name, clock, array_idx=None):
+    def __init__(self, entity, name, clock, array_idx=None, packing=False):
+        self._packing = packing
         super().__init__(entity, name, clock, array_idx=array_idx)
 
         self._bus_width = len(self.bus.data) // 8
@@ -21,6 +32,7 @@ class AvstEthDriver(BusDriver):
             bits_per_word=len(self.bus.data),
         )
 
+        self._packer = SegmentPacker(self._bus_segments, self._bus_segment_width, max_eops=1)
         self.clear_control_signals()
 
     def clear_control_signals(self):
@@ -55,7 +67,20 @@ class AvstEthDriver(BusDriver):
         self.append(data, event=e)
         await e.wait()
 
+    def _drive_word(self, word):
+        data, ena, sop, eop, mty, _ = word
+
+        if ena:
+            self.bus.data.value = int.from_bytes(data, byteorder="big")
+        self.bus.valid.value = ena
+        self.bus.sop.value = sop
+        self.bus.eop.value = eop
+        self.bus.empty.value = mty[eop.bit_length() - 1] if eop else 0
+
     async def _send_thread(self):
+        if self._packing:
+            await self._send_packed_thread()
+
         await self._clk_re
         if self._cfg.get("clk_freq") is None:
             await self._measure_clkfreq(self._clk_re)
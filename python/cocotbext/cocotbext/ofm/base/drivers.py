@@ -56,3 +56,171 @@ class BusDriver(cbd.BusDriver):
         clk_freq = 1e12 / (t2 - t1)
         self._cfg_update(clk_freq=clk_freq)
         return clk_freq
+
+    async def _configure_idle_generator(self):
+        """Measure the clock frequency, when the idle generator can't work without it."""
+
+        if not self._idle_gen.configured and self._cfg.get("clk_freq") is None:
+            await self._clk_re
+            await self._measure_clkfreq()
+
+
+class SegmentPacker:
+    """
+    Plans packets into words of a multi-segment bus (LBUS, segmented AVST).
+
+    Each packet starts at the beginning of a segment and occupies consecutive segments,
+    so several small packets can share one word. Data are copied into the word with slice
+    assignment from a memoryview.
+
+    Atributes:
+        words(list): completed words as tuples (data, ena, sop, eop, mty, items): data is bytearray
+                     with the segments in order, ena, sop and eop are masks (bit i for segment i),
+                     mty is list of empty bytes of each segment and items is the number of data bytes.
+        words_total(int): number of words completed since the packer was created.
+        segments(int): number of segments in the word.
+        segment_size(int): size of the segment in bytes.
+    """
+
+    def __init__(self, segments, segment_size, max_eops=0):
+        self.segments = segments
+        self.segment_size = segment_size
+        self._max_eops = max_eops or segments
+
+        self.words = []
+        self.words_total = 0
+        self._clear_word()
+
+    def _clear_word(self):
+        self._data = bytearray(self.segments * self.segment_size)
+        self._segment = 0
+        self._ena = 0
+        self._sop = 0
+        self._eop = 0
+        self._mty = [0] * self.segments
+        self._eops = 0
+        self._items = 0
+
+    def _finish_word(self):
+        self.words.append((self._data, self._ena, self._sop, self._eop, self._mty, self._items))
+        self.words_total += 1
+        self._clear_word()
+
+    @property
+    def pending(self) -> bool:
+        """True if the current (not completed) word contains any segment."""
+        return self._segment != 0
+
+    def flush(self) -> None:
+        """Completes the current word if it contains any segment."""
+        if self._segment:
+            self._finish_word()
+
+    def skip(self, count) -> None:
+        """Leaves count segments empty (idle)."""
+        for _ in range(count):
+            self._segment += 1
+            if self._segment == self.segments:
+                self._finish_word()
+
+    def pack(self, packet) -> int:
+        """
+        Places packet into words.
+
+        Returns:
+            Index (counted like words_total) of the word with the end of the packet.
+        """
+        mv = memoryview(packet)
+        length = len(mv)
+        assert length
+
+        size = self.segment_size
+
+        # the count of EOPs in one word can be limited (e.g. by the single empty signal)
+        if self._eops >= self._max_eops and self._segment + -(-length // size) <= self.segments:
+            self._finish_word()
+
+        self._sop |= 1 << self._segment
+        pos = 0
+        while True:
+            i = self._segment
+            cnt = min(size, length - pos)
+            self._data[i * size:i * size + cnt] = mv[pos:pos + cnt]
+            self._ena |= 1 << i
+            self._items += cnt
+            pos += cnt
+
+            end = pos == length
+            if end:
+                self._eop |= 1 << i
+                self._mty[i] = size - cnt
+                self._eops += 1
+                index = self.words_total
+
+            self._segment += 1
+            if self._segment == self.segments:
+                self._finish_word()
+
+            if end:
+                return index
+
+
+class SegmentedBusDriver(BusDriver):
+    """
+    BusDriver for multi-segment buses with the segment packing mode.
+
+    In the packing mode, queued packets are planned into whole words by the SegmentPacker
+    (several packets can share one word) and the words are driven one per clock. Idles requested
+    by the idle generator are inserted as empty segments. Children create self._packer and implement
+    _drive_word(word), which assigns the packed word to the bus signals.
+    """
+
+    async def _send_packed_thread(self):
+        await self._clk_re
+        if self._cfg.get("clk_freq") is None:
+            await self._measure_clkfreq(self._clk_re)
+
+        packer = self._packer
+        size = packer.segment_size
+        segments = packer.segments
+        done = []
+        driven = 0
+
+        while True:
+            while self._sendQ:
+                transaction, callback, event, kwargs = self._sendQ.popleft()
+
+                while True:
+                    idle_count = self._idle_gen.get(transaction) // size
+                    if idle_count == 0:
+                        break
+                    packer.skip(idle_count)
+                    self._idle_gen.put(self._idle_tr, items=idle_count * size)
+
+                done.append((packer.pack(transaction), transaction, callback, event))
+                self._idle_gen.put(transaction, items=len(transaction), end=True)
+                if len(transaction) % size:
+                    self._idle_gen.put(self._idle_tr, items=size - len(transaction) % size)
+
+            if not packer.words:
+                if packer.pending:
+                    packer.flush()
+                else:
+                    packer.skip(segments)
+                    self._idle_gen.put(self._idle_tr, items=size * segments)
+
+            words, packer.words = packer.words, []
+            di = 0
+            for word in words:
+                self._drive_word(word)
+                await self._clk_re
+
+                while di < len(done) and done[di][0] == driven:
+                    _, transaction, callback, event = done[di]
+                    di += 1
+                    if event:
+                        event.set()
+                    if callback:
+                        callback(transaction)
+                driven += 1
+            del done[:di]
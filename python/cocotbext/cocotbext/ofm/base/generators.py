@@ -1,3 +1,5 @@
+import random
+
 from .transaction import Transaction, IdleTransaction
 
 
@@ -25,6 +27,11 @@ class IdleGenerator():
     def configure(self, **kwargs):
         pass
 
+    @property
+    def configured(self) -> bool:
+        """True when the generator has all the parameters needed by the get and put methods."""
+        return True
+
     def get(self, transaction: Transaction, *args, **kwargs) -> int:
         """
         return count of items (single IdleTransaction) that should be inserted on bus before next DataTransaction.
@@ -55,25 +62,33 @@ class IdleGenerator():
         """
 
 
-class EthernetRateLimiter(IdleGenerator):
+class RateLimiter(IdleGenerator):
     """
-    Limit throughput to achieve specified maximum rate on Ethernet by generating IdleTransaction.
+    Limit throughput to achieve specified rate of data items on the bus by generating IdleTransaction.
 
-    Ensure the driver puts transaction with "end" argument.
+    Args:
+        bitrate: target bitrate in Mb/s, requires clk_freq and bits_per_word in the driver configuration.
+        rate: target ratio of data items to all items on the bus (0 < rate <= 1), used instead of bitrate.
     """
 
-    def __init__(self, bitrate):
+    def __init__(self, bitrate=None, rate=None):
         super().__init__()
+        assert (bitrate is None) != (rate is None), "specify either bitrate or rate"
 
         self._bitrate = bitrate
         self._current_rate = 0
+        self._packet_overhead = 0
 
-        # Add SFD, CRC, IPG; in items units
-        self._packet_overhead = 8 + 4 + 12
+        if rate is not None:
+            self._cfg_complete = True
+            self._target_rate = rate
 
     def configure(self, **kwargs):
         super().configure(**kwargs)
 
+        if self._bitrate is None:
+            return
+
         #assert bits_per_item == 8
         clk_freq = kwargs.get("clk_freq")
         bits_per_word = kwargs.get("bits_per_word")
@@ -86,6 +101,10 @@ class EthernetRateLimiter(IdleGenerator):
             # that is 23:77 data:idle items ratio
             self._target_rate = target_bitrate / bits_per_word
 
+    @property
+    def configured(self) -> bool:
+        return self._cfg_complete
+
     def get(self, transaction, **kwargs):
         assert self._cfg_complete
         rate = (self._current_rate - self._target_rate) / self._target_rate
@@ -105,3 +124,104 @@ class EthernetRateLimiter(IdleGenerator):
         # decrease current rate with the expected target rate to maintain value near zero
         ir -= items * self._target_rate
         self._current_rate = 0 if ir < 0 else ir
+
+
+class EthernetRateLimiter(RateLimiter):
+    """
+    Limit throughput to achieve specified maximum rate on Ethernet by generating IdleTransaction.
+
+    Ensure the driver puts transaction with "end" argument.
+    """
+
+    def __init__(self, bitrate):
+        super().__init__(bitrate)
+
+        # Add SFD, CRC, IPG; in items units
+        self._packet_overhead = 8 + 4 + 12
+
+
+class BurstGenerator(IdleGenerator):
+    """
+    Generate bursts of data followed by gaps of idles (on/off pattern).
+
+    Args:
+        on: number of data items in a burst, int or (low, high) range of random lengths.
+        off: number of idle items after a burst, int or (low, high) range of random lengths.
+        seed: seed of the random lengths.
+
+    A burst ends with the word, in which its count of data items was reached.
+    """
+
+    def __init__(self, on, off, seed=None):
+        super().__init__()
+
+        self._on = on
+        self._off = off
+        self._rng = random.Random(seed)
+        self._on_left = self._length(on)
+        self._off_left = 0
+
+    def _length(self, length) -> int:
+        if isinstance(length, int):
+            return length
+        return self._rng.randint(*length)
+
+    def get(self, transaction, **kwargs):
+        if isinstance(transaction, IdleTransaction):
+            return 0
+        return self._off_left
+
+    def put(self, transaction, **kwargs):
+        items = kwargs['items']
+
+        if isinstance(transaction, IdleTransaction):
+            self._off_left = max(0, self._off_left - items)
+            return
+
+        self._on_left -= items
+        if self._on_left <= 0:
+            self._on_left = self._length(self._on)
+            self._off_left = self._length(self._off)
+
+
+class TraceGenerator(IdleGenerator):
+    """
+    Replay gaps between transactions from a trace (e.g. captured from the real traffic).
+
+    Args:
+        trace: sequence of numbers of idle items before each transaction, or name of a text file
+               with one number per line.
+        repeat: if True, the trace is replayed again from the start after its end, otherwise
+                no more idles are generated.
+
+    Idle items on the bus since the end of the previous transaction (including the unused items of
+    the last word) count towards the gap. Ensure the driver puts transaction with "end" argument.
+    """
+
+    def __init__(self, trace, repeat=True):
+        super().__init__()
+
+        if isinstance(trace, str):
+            with open(trace) as f:
+                trace = [int(line) for line in f if line.strip()]
+
+        self._trace = list(trace)
+        self._repeat = repeat
+        self._index = 0
+        self._idles = 0
+
+    def get(self, transaction, **kwargs):
+        if isinstance(transaction, IdleTransaction) or self._index >= len(self._trace):
+            return 0
+        return max(0, self._trace[self._index] - self._idles)
+
+    def put(self, transaction, **kwargs):
+        if isinstance(transaction, IdleTransaction):
+            self._idles += kwargs['items']
+            return
+
+        if kwargs.get("end", False):
+            self._idles = 0
+            self._index += 1
+            if self._repeat and self._index == len(self._trace):
+                self._index = 0
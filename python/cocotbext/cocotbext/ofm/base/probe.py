@@ -5,9 +5,9 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import cocotb
-from cocotb.triggers import RisingEdge
+from cocotb.triggers import Event, First, RisingEdge, Timer
 from cocotb.log import SimLog
-from cocotb.utils import get_sim_time
+from cocotb.utils import get_sim_steps, get_sim_time
 from cocotbext.ofm.utils.units import convert_units
 from abc import ABC, abstractmethod
 from typing import Any
@@ -38,6 +38,11 @@ class Probe(ABC):
 
     Note: this class by itself does nothing. It is a generic class made to be derived from for specific usages.
 
+    The log intervals are handled by an event-driven scheduler (_run_schedule): the intervals and the period
+    are converted to simulator steps and Timer triggers are armed only at the interval boundaries and period ticks,
+    where the hooks _interval_started, _period_elapsed and _interval_stopped are called. Between those points
+    the probe does nothing.
+
     Atributes:
         _interface: child of ProbeInterface.
         _clk_re: Rising edge of cocotb clock.
@@ -47,13 +52,17 @@ class Probe(ABC):
                       printed out at the end of the time interval.
         _units(str): general units to be used in the class.
         _thread: cocotb thread for running the persistant probing function.
+        _active: [interval, time of the last tick in steps] of the interval in progress, None outside of intervals.
     """
     def __init__(self, interface: ProbeInterface, period: int = 0, time_units: str = "us", log_intervals: list = [], callback=None) -> None:
         self._interface = interface
         self._clk_re = RisingEdge(self._interface.clock)
-        self._log_intervals = log_intervals
+        self._log_intervals = list(log_intervals)
+        self._log_intervals.sort(key=lambda i: self._interval_steps(i)[0])
         self._period = period
         self._time_units = time_units
+        self._active = None
+        self._schedule_changed = Event()
 
         if not hasattr(self, "log"):
             self.log = SimLog("cocotb.probe.%s" % (self.__class__.__name__))
@@ -87,11 +96,14 @@ class Probe(ABC):
             raise RuntimeError(f"Interval [{start_time},{stop_time},{units}] can't be added, because it overlaps with existing interval.")
 
         self._log_intervals.append(interval)
-        self._log_intervals.sort()
+        self._log_intervals.sort(key=lambda i: self._interval_steps(i)[0])
+        self._schedule_changed.set()
 
     def clear_log_intervals(self) -> None:
         """Clears logging intervals"""
         self._log_intervals.clear()
+        self._active = None
+        self._schedule_changed.set()
 
     def set_log_period(self, period: int, units: str = "us") -> None:
         """
@@ -103,10 +115,11 @@ class Probe(ABC):
         """
         self._period = period
         self._time_units = units
+        self._schedule_changed.set()
 
     def start_log(self) -> None:
         """Manually start logging interval."""
-        if self._simtime_is_in_log_interval():
+        if self._active is not None:
             raise RuntimeError("Can't start a new log, because the previous one wasn't ended yet.")
 
         self.add_log_interval(get_sim_time("step"), None, units=self._get_step_units())
@@ -114,6 +127,8 @@ class Probe(ABC):
     def stop_log(self) -> None:
         """Manually end logging interval."""
         self._log_intervals[0][1] = get_sim_time("step") + 1
+        self._log_intervals[0][2] = self._get_step_units()
+        self._schedule_changed.set()
 
     def _get_step_units(self) -> str:
         """Get units of step."""
@@ -128,44 +143,6 @@ class Probe(ABC):
         """
         return {"s": "sec"}.get(time_units, time_units)
 
-    def _simtime_is_in_log_interval(self) -> bool:
-        """
-        Checks if the simulation time is in one of the defined intervals.
-
-        Returns:
-            True if in interval, False if not.
-        """
-        start_time, stop_time = 0, 0
-        units, gst_units = "us", "us"
-        defaults = True
-
-        for _ in range(len(self._log_intervals)):
-            start_time, stop_time, units, end_registered = self._log_intervals[0]
-            gst_units = self._format_units_for_get_sim_time(units)
-            defaults = False
-
-            if stop_time is None:
-                break
-
-            if get_sim_time(units=gst_units) > stop_time:
-                if not end_registered:
-                    self._log_intervals[0][3] = True
-                    return True
-                else:
-                    del self._log_intervals[0]
-            else:
-                break
-
-        if not defaults:
-            if get_sim_time(units=gst_units) >= start_time:
-                if stop_time is None:
-                    return True
-
-                if get_sim_time(units=gst_units) <= stop_time:
-                    return True
-
-        return False
-
     def _interval_overlaps_log_intervals(self, interval: list) -> bool:
         """
         Checks if passed interval overlaps with one of the intevals in _log_intervals.
@@ -204,28 +181,81 @@ class Probe(ABC):
 
         return False
 
-    def _get_log_period(self) -> int:
-        """
-        Returns set period. If no period is set, it is the length of the closest interval. Returns 0 if the
-        sim time is not in interval, the interval lasts until the end of the simulation, or no interval is set.
-        """
-        if self._period == 0:
-            try:
-                start_time, stop_time, units, _ = self._log_intervals[0]
-
-            except IndexError:
-                return 0
+    def _to_steps(self, value, units: str) -> int:
+        """Converts time to simulator steps."""
+        return get_sim_steps(value, self._format_units_for_get_sim_time(units), round_mode="round")
 
-            gst_units = self._format_units_for_get_sim_time(units)
-
-            if stop_time is None:
-                return 0
-
-            if get_sim_time(units=gst_units) < start_time:
-                return 0
+    def _interval_steps(self, interval: list) -> tuple:
+        """Returns (start, stop) of the interval in simulator steps, stop is None for endless interval."""
+        start_time, stop_time, units, _ = interval
+        return self._to_steps(start_time, units), (None if stop_time is None else self._to_steps(stop_time, units))
+
+    def _next_schedule_point(self, now: int) -> tuple:
+        """Returns (time in steps, action) of the next point of the schedule, (None, None) if there is none."""
+        if self._active is None:
+            while self._log_intervals:
+                interval = self._log_intervals[0]
+                start, stop = self._interval_steps(interval)
+                if stop is not None and stop < now:
+                    del self._log_intervals[0]
+                    continue
+
+                start = max(start, now)
+                return start, lambda: self._start_interval(interval, start)
+            return None, None
+
+        interval, tick = self._active
+        start, stop = self._interval_steps(interval)
+        period = self._to_steps(self._period, self._time_units) if self._period else 0
+
+        next_tick = tick + period if period else stop
+        if next_tick is not None and (stop is None or next_tick <= stop):
+            return next_tick, lambda: self._tick(next_tick)
+        return stop, self._stop_interval
+
+    def _start_interval(self, interval: list, time: int) -> None:
+        self._active = [interval, time]
+        self._interval_started()
+
+    def _tick(self, time: int) -> None:
+        self._active[1] = time
+        self._period_elapsed()
+        if not self._period:
+            self._stop_interval()
+
+    def _stop_interval(self) -> None:
+        interval = self._active[0]
+        self._active = None
+        if interval in self._log_intervals:
+            self._log_intervals.remove(interval)
+        self._interval_stopped()
+
+    async def _run_schedule(self) -> None:
+        """Waits for the points of the log intervals schedule and calls the hooks there."""
+        while True:
+            self._schedule_changed.clear()
+            now = get_sim_time("step")
+            time, action = self._next_schedule_point(now)
+
+            if time is None:
+                await self._schedule_changed.wait()
+                continue
+
+            if time > now:
+                await First(Timer(time - now, "step"), self._schedule_changed.wait())
+                if get_sim_time("step") < time:
+                    continue
+
+            action()
+
+    def _interval_started(self) -> None:
+        """Called at the start of a log interval."""
+        pass
 
-            start_time = convert_units(start_time, units.strip("s"), self._time_units.strip("s"))[0]
-            stop_time = convert_units(stop_time, units.strip("s"), self._time_units.strip("s"))[0]
-            return stop_time - start_time
+    def _period_elapsed(self) -> None:
+        """Called at each period tick of a log interval (at the end of the interval if no period is set)."""
+        pass
 
-        return self._period
+    def _interval_stopped(self) -> None:
+        """Called at the end of a log interval."""
+        pass
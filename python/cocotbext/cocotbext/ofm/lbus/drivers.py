@@ -2,17 +2,25 @@ from typing import Any
 
 from cocotb.triggers import Event
 
-from ..base.drivers import BusDriver
+from ..base.drivers import SegmentedBusDriver, SegmentPacker
 from ..base.transaction import IdleTransaction
 
 #def byte_deserialize(data):
 #    return reduce(operator.or_, [(data[i] & 0xff) << (8*i) for i in range(len(data))])
 
 
-class LBusDriver(BusDriver):
+class LBusDriver(SegmentedBusDriver):
+    """
+    Driver of the LBUS.
+
+    Args:
+        packing: enables the segment packing mode, in which the queued packets are planned into whole
+                 words (see SegmentedBusDriver). Otherwise, packets are written segment by segment.
+    """
     _signals = ["data", "ena", "sop", "eop", "err", "mty"]
 
-    def __init__(self, entity, name, clock, array_idx=None):
+    def __init__(self, entity, name, clock, array_idx=None, packing=False):
+        self._packing = packing
         super().__init__(entity, name, clock, array_idx=array_idx)
         self._segments = len(self.bus.data)
         self._bytes_per_item = len(self.bus.data[0]) // 8
@@ -21,6 +29,8 @@ class LBusDriver(BusDriver):
             bits_per_word=self._bytes_per_item * 8 * self._segments
         )
         self._next_segment = 0
+        self._packer = SegmentPacker(self._segments, self._bytes_per_item)
+        self._mty_driven = [0] * self._segments
         self.clear_control_signals()
 
     def clear_control_signals(self):
@@ -56,7 +66,26 @@ class LBusDriver(BusDriver):
         self.append(data, event=e)
         await e.wait()
 
+    def _drive_word(self, word):
+        data, ena, sop, eop, mty, _ = word
+        bpi = self._bytes_per_item
+        mv = memoryview(data)
+
+        for i in range(self._segments):
+            if ena >> i & 1:
+                self.bus.data[i].value = int.from_bytes(mv[i * bpi:(i + 1) * bpi], byteorder="big")
+            if mty[i] != self._mty_driven[i]:
+                self.bus.mty[i].value = mty[i]
+                self._mty_driven[i] = mty[i]
+
+        self.bus.ena.value = ena
+        self.bus.sop.value = sop
+        self.bus.eop.value = eop
+
     async def _send_thread(self):
+        if self._packing:
+            await self._send_packed_thread()
+
         await self._clk_re
         if self._cfg.get("clk_freq") is None:
             await self._measure_clkfreq(self._clk_re)
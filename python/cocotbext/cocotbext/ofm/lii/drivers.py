@@ -5,18 +5,32 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import random
-from cocotb_bus.drivers import BusDriver
 from cocotb.triggers import RisingEdge
 
+from ..base.drivers import BusDriver
+
 
 class LIIDriver(BusDriver):
+    """
+    Driver of the LII bus.
+
+    By default, frames are written byte by byte with random idle cycles after each word and random
+    positions of the CRC status; the idle cycles requested by the idle generator (set_idle_generator)
+    are added before the frame. With word_mode=True, frames are written word by word: each frame starts
+    at the beginning of a word and idle cycles are inserted only by the idle generator,
+    e.g. EthernetRateLimiter for an exact line rate. The CRC status (crcok, default 1, can be passed
+    to append as keyword argument) is signalled in the cycle after the EOF word.
+    """
     _signals = ["d", "db", "sof", "eof", "rdy", "crcok", "crcvld"]
 
-    def __init__(self, entity, name, clock, array_idx=None):
-        BusDriver.__init__(self, entity, name, clock, array_idx=array_idx)
+    def __init__(self, entity, name, clock, array_idx=None, word_mode=False):
+        super().__init__(entity, name, clock, array_idx=array_idx)
         self.clock = clock
         self._bytes = len(self.bus.d) // 8
         self._block_size = 4 if self._bytes <= 4 else 8
+        self._word_mode = word_mode
+        self._crc_status = None
+        self._cfg_update(bits_per_word=len(self.bus.d))
         self._clear_signals()
         self._data = bytearray(self._bytes)
         self._valid_bytes = 0
@@ -65,15 +79,36 @@ class LIIDriver(BusDriver):
         #print("crc_flag    : " + str(self.bus.crcvld.value))
 
         # Random (1 to 5) idle cycles
+        idle = self._bytes - self._valid_bytes
         for ii in range(random.randint(1, 6)):
             await RisingEdge(self.clock)
             self._clear_signals()
             self._offset = 0
+            self._idle_gen.put(self._idle_tr, items=idle)
+            idle = self._bytes
+
+    async def _write_generator_idles(self, transaction):
+        """Writes the idle cycles requested by the idle generator before the frame."""
+        while True:
+            idle_count = self._idle_gen.get(transaction) // self._bytes
+            if idle_count == 0:
+                return
+
+            if self._offset != 0:
+                await self._write_word()
+                continue
+
+            for _ in range(idle_count):
+                await RisingEdge(self.clock)
+                self._clear_signals()
+                self._idle_gen.put(self._idle_tr, items=self._bytes)
 
-    async def _send_transaction(self, transaction):
+    async def _send_transaction(self, transaction, crc_status=1):
         while (self._blk_pos != 0) or (self._sof_flag != 0) or (self._vld_flag != 0):
             await self._move_byte()
 
+        await self._write_generator_idles(transaction)
+
         for bb in range(0, len(transaction)):
             self._vld_flag = 1
             self._valid_bytes += 1
@@ -97,7 +132,8 @@ class LIIDriver(BusDriver):
 
             await self._move_byte()
 
-        await self._send_crc_status(1)
+        self._idle_gen.put(transaction, items=len(transaction), start=True, end=True)
+        await self._send_crc_status(crc_status)
 
     async def _send_crc_status(self, crc_status):
         # Random idle bytes
@@ -110,19 +146,96 @@ class LIIDriver(BusDriver):
         self.bus.crcok.value = crc_status
         self.bus.crcvld.value = 1
 
+    def _drive_crc_status(self):
+        """Drives the pending CRC status in the current cycle (word mode)."""
+        if self._crc_status is None:
+            self.bus.crcvld.value = 0
+        else:
+            self.bus.crcok.value = self._crc_status
+            self.bus.crcvld.value = 1
+            self._crc_status = None
+
+    async def _write_idle(self):
+        """Writes one idle cycle (word mode)."""
+        self._clear_signals()
+        self._drive_crc_status()
+        await self._clk_re
+        self._idle_gen.put(self._idle_tr, items=self._bytes)
+
+    async def _send_words(self, transaction, crc_status=1):
+        """Writes the frame word by word, starting at the beginning of the word (word mode)."""
+        data = memoryview(transaction)
+        length = len(data)
+        assert length
+
+        for pos in range(0, length, self._bytes):
+            end = pos + self._bytes >= length
+            cnt = length - pos if end else self._bytes
+            self._data[:cnt] = data[pos:pos + cnt]
+
+            self.bus.d.value = int.from_bytes(self._data, 'little')
+            self.bus.sof.value = 1 if pos == 0 else 0
+            self.bus.eof.value = end
+            self.bus.db.value = cnt
+            self.bus.rdy.value = 1
+            self._drive_crc_status()
+            await self._clk_re
+
+            self._idle_gen.put(transaction, items=cnt, start=(pos == 0), end=end)
+            if cnt != self._bytes:
+                self._idle_gen.put(self._idle_tr, items=self._bytes - cnt)
+
+        self._crc_status = crc_status
+
+    async def _send_thread_words(self):
+        await self._clk_re
+        if self._cfg.get("clk_freq") is None:
+            await self._measure_clkfreq(self._clk_re)
+
+        while True:
+            if self._sendQ:
+                transaction, callback, event, kwargs = self._sendQ.popleft()
+            else:
+                transaction, callback, event, kwargs = self._idle_tr, None, None, {}
+
+            while True:
+                idle_count = self._idle_gen.get(transaction) // self._bytes
+                if idle_count == 0:
+                    break
+
+                for _ in range(idle_count):
+                    await self._write_idle()
+
+            if transaction is self._idle_tr:
+                await self._write_idle()
+                continue
+
+            await self._send_words(transaction, kwargs.get("crcok", 1))
+            self.frame_cnt += 1
+
+            if event:
+                event.set()
+
+            if callback:
+                callback(transaction)
+
     async def _send_thread(self):
+        if self._word_mode:
+            await self._send_thread_words()
+
         while True:
             # Sleep until we have something to send
             while not self._sendQ:
                 self._pending.clear()
                 await self._pending.wait()
 
+            await self._configure_idle_generator()
             await self._write_word()
 
             while self._sendQ:
                 transaction, callback, event, kwargs = self._sendQ.popleft()
 
-                await self._send_transaction(transaction)
+                await self._send_transaction(transaction, kwargs.get("crcok", 1))
                 self.frame_cnt += 1
 
                 if event:
@@ -4,20 +4,140 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from cocotb_bus.drivers import BusDriver
 from cocotb.triggers import RisingEdge
+from cocotbext.ofm.base.drivers import BusDriver
 from cocotbext.ofm.mfb.utils import get_mfb_params
 
 import copy
 
 
+class MFBWordPacker:
+    """Plans MFB frames into whole MFB words.
+
+    The packer follows the same placement rules as the block-by-block algorithm
+    of the MFBDriver (frames start at block boundary, only one SOF and one EOF
+    per region), but it works on whole frames: data are copied into the word
+    with slice assignment from a memoryview and the SOF/EOF/pos vectors are
+    built directly as integers ready to be assigned to the bus signals.
+
+    Atributes:
+        words(list): completed words as tuples (data, sof, eof, sof_pos, eof_pos, items), all values are integers,
+                     items is the number of data items in the word.
+        words_total(int): number of words completed since the packer was created.
+    """
+
+    def __init__(self, regions, region_size, block_size, sof_pos_width=0, eof_pos_width=0):
+        self._regions = regions
+        self._block_size = block_size
+        self._region_items = region_size * block_size
+        self._items = regions * self._region_items
+        self._sof_pos_width = sof_pos_width
+        self._eof_pos_width = eof_pos_width
+
+        self.words = []
+        self.words_total = 0
+        self._clear_word()
+
+    def _clear_word(self):
+        self._data = bytearray(self._items)
+        self._offset = 0
+        self._sof = 0
+        self._eof = 0
+        self._sof_pos = 0
+        self._eof_pos = 0
+        self._valid = 0
+
+    def _finish_word(self):
+        self.words.append((int.from_bytes(self._data, 'little'), self._sof, self._eof, self._sof_pos, self._eof_pos, self._valid))
+        self.words_total += 1
+        self._clear_word()
+
+    @property
+    def pending(self) -> bool:
+        """True if the current (not completed) word contains any data."""
+        return self._offset != 0
+
+    def flush(self) -> None:
+        """Completes the current word if it contains any data."""
+        if self._offset:
+            self._finish_word()
+
+    def pack(self, frame) -> int:
+        """Places frame into words.
+
+        Args:
+            frame: frame data (bytes, bytearray, memoryview or list of integers).
+
+        Returns:
+            Number of words completed so far (words_total) after the frame was placed.
+        """
+        if not isinstance(frame, (bytes, bytearray, memoryview)):
+            frame = bytes(frame)
+
+        length = len(frame)
+        if length == 0:
+            return self.words_total
+
+        ri = self._region_items
+        bs = self._block_size
+
+        # two SOFs not allowed in the same region
+        if self._sof >> (self._offset // ri) & 1:
+            self._finish_word()
+
+        # two EOFs not allowed in the same region
+        er = (self._offset + length - 1) // ri
+        if er < self._regions and self._eof >> er & 1:
+            self._finish_word()
+
+        r, p = divmod(self._offset, ri)
+        self._sof |= 1 << r
+        self._sof_pos |= (p // bs) << (r * self._sof_pos_width)
+
+        mv = memoryview(frame)
+        pos = 0
+        while True:
+            off = self._offset
+            cnt = min(length - pos, self._items - off)
+            self._data[off:off + cnt] = mv[pos:pos + cnt]
+            self._valid += cnt
+            pos += cnt
+
+            if pos == length:
+                # mark EOF in the region of the last block
+                r, p = divmod(off + cnt - 1, ri)
+                self._eof |= 1 << r
+                self._eof_pos |= p << (r * self._eof_pos_width)
+
+                self._offset = off + -(-cnt // bs) * bs
+                if self._offset >= self._items:
+                    self._finish_word()
+                return self.words_total
+
+            self._offset = self._items
+            self._finish_word()
+
+
 class MFBDriver(BusDriver):
+    """Driver for the MFB bus.
+
+    Atributes:
+        frame_cnt(int): number of frames sent.
+        word_packing(bool): if True, queued frames are planned into whole MFB words by the MFBWordPacker
+                            and the words are driven one per clock. Otherwise the frames are written block by block.
+                            Both modes produce the same waveform on the bus.
+
+    In the word packing mode, idle words are inserted according to the idle generator (set_idle_generator),
+    e.g. RateLimiter for an exact throughput. The block mode keeps its own timing.
+    """
+
     _signals = ["data", "sof_pos", "eof_pos", "sof", "eof", "src_rdy", "dst_rdy"]
 
-    def __init__(self, entity, name, clock, array_idx=None, mfb_params=None):
+    def __init__(self, entity, name, clock, array_idx=None, mfb_params=None, word_packing=True):
         BusDriver.__init__(self, entity, name, clock, array_idx=array_idx)
         self.clock = clock
         self.frame_cnt = 0
+        self.word_packing = word_packing
         self._regions, self._region_size, self._block_size, self._item_width = get_mfb_params(
             self.bus.data, self.bus.sof_pos, self.bus.eof_pos, self.bus.sof, mfb_params
         )
@@ -26,6 +146,13 @@ class MFBDriver(BusDriver):
         self._item_offset = 0
         self._clear_control_signals()
         self.bus.src_rdy.value = 0
+        self._cfg_update(bits_per_word=self._items * self._item_width)
+
+        self._packer = MFBWordPacker(
+            self._regions, self._region_size, self._block_size,
+            len(self.bus.sof_pos) // self._regions if self._region_size > 1 else 0,
+            len(self.bus.eof_pos) // self._regions,
+        )
 
     def _clear_control_signals(self):
         self._data = bytearray(self._items)
@@ -147,6 +274,83 @@ class MFBDriver(BusDriver):
                     self._src_rdy = 1
                     await self._moveBlock()
 
+    async def _drive_word(self, word):
+        """Drives one packed word on the bus and waits until it is accepted."""
+        re = RisingEdge(self.clock)
+        data, sof, eof, sof_pos, eof_pos, _ = word
+
+        self.bus.data.value = data
+        self.bus.sof.value = sof
+        self.bus.eof.value = eof
+        if (self._region_size > 1):
+            self.bus.sof_pos.value = sof_pos
+        self.bus.eof_pos.value = eof_pos
+        self.bus.src_rdy.value = 1
+
+        while True:
+            await re
+            if self.bus.dst_rdy.value == 1:
+                break
+
+    async def _drive_idles(self, transaction):
+        """Drives idle words requested by the idle generator before the next data word."""
+        while True:
+            idle_count = self._idle_gen.get(transaction) // self._items
+            if idle_count == 0:
+                return
+
+            self.bus.src_rdy.value = 0
+            for _ in range(idle_count):
+                await self._clk_re
+                self._idle_gen.put(self._idle_tr, items=self._items)
+
+    def _word_sent(self, transaction, word):
+        """Reports the data and the unused items of the accepted word to the idle generator."""
+        items, ends = word[5], bin(word[2]).count("1")
+
+        self._idle_gen.put(transaction, items=items, end=ends > 0)
+        for _ in range(ends - 1):
+            self._idle_gen.put(transaction, items=0, end=True)
+        if items < self._items:
+            self._idle_gen.put(self._idle_tr, items=self._items - items)
+
+    async def _send_packed(self):
+        """Plans all queued frames into words and drives the completed words, until the queue is empty.
+
+        The last, partially filled word stays in the packer, so frames queued meanwhile can be added to it.
+        """
+        packer = self._packer
+
+        while self._sendQ:
+            base = packer.words_total
+            done = []
+            while self._sendQ:
+                transaction, callback, event, kwargs = self._sendQ.popleft()
+                done.append((packer.pack(transaction) - base, transaction, callback, event))
+                self._last_frame = transaction
+
+            words, packer.words = packer.words, []
+
+            # Frames are completed (callbacks and events) at the same moment as in the block mode:
+            # before the word with the last block of the frame is driven, or after the word is accepted,
+            # when the frame ends exactly at the end of the word.
+            di = 0
+            for wi in range(len(words) + 1):
+                while di < len(done) and done[di][0] == wi:
+                    _, transaction, callback, event = done[di]
+                    di += 1
+                    self.frame_cnt += 1
+                    if event:
+                        event.set()
+                    if callback:
+                        callback(transaction)
+
+                if wi < len(words):
+                    transaction = done[min(di, len(done) - 1)][1]
+                    await self._drive_idles(transaction)
+                    await self._drive_word(words[wi])
+                    self._word_sent(transaction, words[wi])
+
     async def _send_thread(self):
         while True:
             # Sleep until we have something to send
@@ -154,6 +358,21 @@ class MFBDriver(BusDriver):
                 self._pending.clear()
                 await self._pending.wait()
 
+            if self.word_packing:
+                await self._configure_idle_generator()
+                await self._send_packed()
+
+                if self._packer.pending:
+                    self._packer.flush()
+                    word = self._packer.words.pop()
+                    await self._drive_idles(self._last_frame)
+                    await self._drive_word(word)
+                    self._word_sent(self._last_frame, word)
+                else:
+                    await self._moveWord()
+                await self._moveWord()
+                continue
+
             while self._sendQ:
                 transaction, callback, event, kwargs = self._sendQ.popleft()
                 await self._write_frame(transaction)
@@ -4,9 +4,11 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import logging
+
 from cocotb_bus.monitors import BusMonitor
 from cocotb.triggers import RisingEdge
-from cocotbext.ofm.mfb.utils import get_mfb_params, signal_unpack
+from cocotbext.ofm.mfb.utils import get_mfb_params, value_unpack
 
 
 class MFBProtocolError(Exception):
@@ -35,13 +37,29 @@ class MFBMonitor(BusMonitor):
         else:
             return (signal_src_rdy.value == 1) and (signal_dst_rdy.value == 1)
 
+    def _signal_width(self, signal):
+        """Width of one region part of the signal in bits."""
+        return 0 if signal is None else len(signal) // self._regions
+
+    def _signal_int(self, signal):
+        return 0 if signal is None or self._signal_width(signal) == 0 else signal.value.integer
+
     async def _monitor_recv(self):
         """Watch the pins and reconstruct transactions."""
         # Avoid spurious object creation by recycling
         clkedge = RisingEdge(self.clock)
-        frame = b""
+        frame = bytearray()
         in_frame = False
 
+        regions = self._regions
+        ri = self._region_items
+        bs = self._block_size
+        sof_pos_width = self._signal_width(self.bus.sof_pos)
+        eof_pos_width = self._signal_width(self.bus.eof_pos)
+
+        def items(length):
+            return length * 8 // self._item_width
+
         while True:
             await clkedge
 
@@ -49,74 +67,91 @@ class MFBMonitor(BusMonitor):
                 continue
 
             if self._is_valid_word(self.bus.src_rdy, self.bus.dst_rdy):
-                self.log.debug("valid MFB word")
+                debug = self.log.isEnabledFor(logging.DEBUG)
+                if debug:
+                    self.log.debug("valid MFB word")
 
                 data_val = self.bus.data.value
                 data_val.big_endian = False
-                data_bytes = data_val.buff
+                data_bytes = memoryview(data_val.buff)
 
-                self._sof_arr = signal_unpack(self._regions, self.bus.sof)
-                self._eof_arr = signal_unpack(self._regions, self.bus.eof)
-                self._sof_pos_arr = signal_unpack(self._regions, self.bus.sof_pos)
-                self._eof_pos_arr = signal_unpack(self._regions, self.bus.eof_pos)
+                sof = self.bus.sof.value.integer
+                eof = self.bus.eof.value.integer
 
-                self.log.debug(f"sof_arr {str(self._sof_arr)}")
-                self.log.debug(f"eof_arr {str(self._eof_arr)}")
-                self.log.debug(f"sof_pos_arr {str(self._sof_pos_arr)}")
-                self.log.debug(f"eof_pos_arr {str(self._eof_pos_arr)}")
-
-                for rr in range(self._regions):
+                if not sof and not eof:
+                    if in_frame:
+                        # Whole word is the middle of the frame.
+                        frame += data_bytes[:regions * ri]
+                        self.item_cnt += regions * items(ri)
+                    continue
+
+                self._sof_arr = value_unpack(regions, sof, 1)
+                self._eof_arr = value_unpack(regions, eof, 1)
+                self._sof_pos_arr = value_unpack(regions, self._signal_int(self.bus.sof_pos), sof_pos_width)
+                self._eof_pos_arr = value_unpack(regions, self._signal_int(self.bus.eof_pos), eof_pos_width)
+
+                if debug:
+                    self.log.debug(f"sof_arr {str(self._sof_arr)}")
+                    self.log.debug(f"eof_arr {str(self._eof_arr)}")
+                    self.log.debug(f"sof_pos_arr {str(self._sof_pos_arr)}")
+                    self.log.debug(f"eof_pos_arr {str(self._eof_pos_arr)}")
+
+                for rr in range(regions):
                     # Iterating through the regions.
                     eof_done = False
-                    rs_inx = (rr * self._region_items)
-                    re_inx = (rr * self._region_items + self._region_items)
-                    ee_idx = (rr * self._region_items + self._eof_pos_arr[rr] + 1)
-                    ss_idx = (rr * self._region_items + (self._sof_pos_arr[rr] * self._block_size))
-
-                    self.log.debug(f"rs_inx {str(rs_inx)}")
-                    self.log.debug(f"re_inx {str(re_inx)}")
-                    self.log.debug(f"ee_idx {str(ee_idx)}")
-                    self.log.debug(f"ss_idx {str(ss_idx)}")
-
-                    if (self._eof_arr[rr] == 1) and (in_frame):
+                    rs_inx = rr * ri
+                    re_inx = rs_inx + ri
+                    ee_idx = rs_inx + self._eof_pos_arr[rr] + 1
+                    ss_idx = rs_inx + self._sof_pos_arr[rr] * bs
+
+                    if debug:
+                        self.log.debug(f"rs_inx {str(rs_inx)}")
+                        self.log.debug(f"re_inx {str(re_inx)}")
+                        self.log.debug(f"ee_idx {str(ee_idx)}")
+                        self.log.debug(f"ss_idx {str(ss_idx)}")
+
+                    if self._eof_arr[rr] and in_frame:
                         # Checks if there is a packet that is being processed and if it ends in this region.
-                        self.log.debug("Frame End")
                         in_frame = False
                         eof_done = True
                         frame += data_bytes[rs_inx:ee_idx]
-                        self.item_cnt += len(data_bytes[rs_inx:ee_idx])*8 // self._item_width
-                        self.log.debug(f"frame done {frame.hex()}")
-                        self._recv(frame)
+                        self.item_cnt += items(ee_idx - rs_inx)
+                        if debug:
+                            self.log.debug("Frame End")
+                            self.log.debug(f"frame done {frame.hex()}")
+                        self._recv(bytes(frame))
                         self.frame_cnt += 1
 
                     if in_frame:
                         # Region with a valid 'middle of packet'.
                         frame += data_bytes[rs_inx:re_inx]
-                        self.item_cnt += len(data_bytes[rs_inx:re_inx])*8 // self._item_width
-                        self.log.debug(f"frame middle {frame.hex()}")
+                        self.item_cnt += items(ri)
+                        if debug:
+                            self.log.debug(f"frame middle {frame.hex()}")
 
-                    if self._sof_arr[rr] == 1:
+                    if self._sof_arr[rr]:
                         # Checking for beginning of a packet.
-                        self.log.debug("Frame Start")
+                        if debug:
+                            self.log.debug("Frame Start")
                         if in_frame:
                             raise MFBProtocolError("Duplicate start-of-frame received on MFB bus!")
                         in_frame = True
-                        frame = b""
+                        frame = bytearray()
 
-                        if (self._eof_arr[rr] == 1) and (not eof_done):
+                        if self._eof_arr[rr] and (not eof_done):
                             # Checking if the packet ends in the same regions where it began.
-                            self.log.debug("Frame End in single region")
-                            if not in_frame:
-                                raise MFBProtocolError("Duplicate end-of-frame received on MFB bus!")
                             in_frame = False
                             frame += data_bytes[ss_idx:ee_idx]
-                            self.item_cnt += len(data_bytes[ss_idx:ee_idx])*8 // self._item_width
-                            self.log.debug(f"frame done single {frame.hex()}")
-                            self._recv(frame)
+                            self.item_cnt += items(max(ee_idx - ss_idx, 0))
+                            if debug:
+                                self.log.debug("Frame End in single region")
+                                self.log.debug(f"frame done single {frame.hex()}")
+                            self._recv(bytes(frame))
                             self.frame_cnt += 1
 
                         else:
                             # Packet continues into another region.
                             frame += data_bytes[ss_idx:re_inx]
-                            self.item_cnt += len(data_bytes[ss_idx:re_inx])*8 // self._item_width
-                            self.log.debug(f"frame start {frame.hex()}")
+                            self.item_cnt += items(re_inx - ss_idx)
+                            if debug:
+                                self.log.debug(f"frame start {frame.hex()}")
@@ -59,3 +59,18 @@ def signal_unpack(items, signal):
         signal_arr[ii] = signal.value[bi:(bi + size - 1)].integer
 
     return signal_arr
+
+
+def value_unpack(items, value, size):
+    """Splits integer value of a signal into a list of items.
+
+    Args:
+        items: number of items (e.g. MFB regions).
+        value: integer value of the whole signal, item 0 is in the least significant bits.
+        size: width of one item in bits.
+
+    Returns:
+        List of integer values of the items.
+    """
+    mask = (1 << size) - 1
+    return [(value >> (ii * size)) & mask for ii in range(items)]
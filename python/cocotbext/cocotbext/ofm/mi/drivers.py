@@ -4,6 +4,8 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+from cocotb.utils import get_sim_time
+
 from cocotbext.ofm.base.drivers import BusDriver
 from cocotbext.ofm.utils.math import ceildiv
 from cocotbext.ofm.utils.signals import await_signal_sync
@@ -16,6 +18,9 @@ class MIMasterDriver(BusDriver):
         _clk_re(cocotb.triggers.RisingEdge): object used for awaiting the rising edge of clock signal.
         addr_width(int): width of ADDR port in bytes.
         data_width(int): width of DATA port in bytes.
+        pipelined(bool): if True, read and write use the burst functions (read_burst, write_burst).
+        max_outstanding(int): maximum number of reads waiting for DRDY in the burst read.
+        wr_cnt(int), rd_cnt(int): number of write and read transactions accepted by the MI bus (ARDY).
         _addr(int), _dwr(bytearray), _be(int), _wr(int), _rd(int): control signals that are then propagated to the MI BUS.
 
     """
@@ -23,13 +28,29 @@ class MIMasterDriver(BusDriver):
     _signals = ["addr", "dwr", "be", "wr", "rd", "ardy", "drd", "drdy"]
     _optional_signals = ["mwr"]
 
-    def __init__(self, entity, name, clock, array_idx=None) -> None:
+    def __init__(self, entity, name, clock, array_idx=None, pipelined: bool = False, max_outstanding: int = 8) -> None:
         super().__init__(entity, name, clock, array_idx=array_idx)
         self.addr_width = len(self.bus.addr) // 8
         self.data_width = len(self.bus.dwr) // 8
+        self.pipelined = pipelined
+        self.max_outstanding = max_outstanding
+        self.clear_stats()
         self._clear_control_signals()
         self._propagate_control_signals()
 
+    def clear_stats(self) -> None:
+        """Clears transaction counters and starts a new measurement of the transaction rate."""
+
+        self.wr_cnt = 0
+        self.rd_cnt = 0
+        self._stats_start = get_sim_time("us")
+
+    def ops_per_us(self) -> float:
+        """Returns number of MI transactions (reads and writes) per simulated microsecond since the last clear_stats call."""
+
+        elapsed = get_sim_time("us") - self._stats_start
+        return (self.wr_cnt + self.rd_cnt) / elapsed if elapsed else 0.0
+
     def _clear_control_signals(self) -> None:
         """Sets control signals to default values without sending them to the MI bus."""
 
@@ -62,6 +83,12 @@ class MIMasterDriver(BusDriver):
 
         """
 
+        if self.pipelined:
+            await self.write_burst(addr, dwr, byte_enable)
+            if sync:
+                await self._clk_re
+            return
+
         cycles = ceildiv(self.data_width, len(dwr))
 
         for i in range(cycles):
@@ -94,6 +121,7 @@ class MIMasterDriver(BusDriver):
         self._propagate_control_signals()
 
         await await_signal_sync(self._clk_re, self.bus.ardy)
+        self.wr_cnt += 1
 
         self._clear_control_signals()
         self._propagate_control_signals()
@@ -130,6 +158,12 @@ class MIMasterDriver(BusDriver):
 
         """
 
+        if self.pipelined:
+            drd = await self.read_burst(addr, byte_count, byte_enable)
+            if sync:
+                await self._clk_re
+            return drd
+
         drd = bytearray(byte_count)
 
         cycles = ceildiv(self.data_width, byte_count)
@@ -166,6 +200,7 @@ class MIMasterDriver(BusDriver):
         self._propagate_control_signals()
 
         await await_signal_sync(self._clk_re, self.bus.ardy)
+        self.rd_cnt += 1
 
         self._clear_control_signals()
         self._propagate_control_signals()
@@ -198,6 +233,90 @@ class MIMasterDriver(BusDriver):
         drd = await self.read(addr, 8, byte_enable, sync)
         return bytes(drd)
 
+    async def write_burst(self, addr: int, data: bytes, byte_enable: int = None) -> None:
+        """Writes data as a stream of back-to-back write transactions without idle cycles.
+
+        Args:
+            addr: address of the first transaction, each next transaction is written to the next DATA word.
+            data: data to be written, the last transaction can be shorter than the DATA word.
+            byte_enable: optional, custom byte enable for every transaction, if not set, all bytes are considered to be valid.
+
+        """
+
+        data = bytes(data)
+        dw = self.data_width
+
+        await self._clk_re
+
+        for i in range(ceildiv(dw, len(data))):
+            self._wr = 1
+            self._addr = addr + i * dw
+            self._dwr = data[i * dw: (i + 1) * dw]
+            self._be = byte_enable if byte_enable is not None else 2**len(self._dwr) - 1
+            self._propagate_control_signals()
+
+            await self._clk_re
+            while self.bus.ardy.value != 1:
+                await self._clk_re
+            self.wr_cnt += 1
+
+        self._clear_control_signals()
+        self._propagate_control_signals()
+
+    async def read_burst(self, addr: int, byte_count: int, byte_enable: int = None) -> bytes:
+        """Reads data by a stream of pipelined read transactions.
+
+        New read transaction is issued in every clock cycle until max_outstanding reads wait for DRDY.
+        The responses are matched to the reads in order.
+
+        Args:
+            addr: address of the first transaction, each next transaction reads the next DATA word.
+            byte_count: number of bytes to be returned.
+            byte_enable: optional, custom byte enable for every transaction, if not set, all bytes are considered to be valid.
+
+        Returns:
+            Returns data of the requested length.
+
+        """
+
+        dw = self.data_width
+        words = ceildiv(dw, byte_count)
+        drd = bytearray(words * dw)
+        issued = 0
+        received = 0
+
+        await self._clk_re
+
+        while received < words:
+            request = issued < words and issued - received < self.max_outstanding
+
+            if request:
+                self._rd = 1
+                self._addr = addr + issued * dw
+                self._be = byte_enable if byte_enable is not None else 2**dw - 1
+            else:
+                self._clear_control_signals()
+            self._propagate_control_signals()
+
+            await self._clk_re
+
+            if request and self.bus.ardy.value == 1:
+                issued += 1
+                self.rd_cnt += 1
+
+            if received < issued and self.bus.drdy.value == 1:
+                rd_data = self.bus.drd.value
+                rd_data.big_endian = False
+                drd[received * dw: (received + 1) * dw] = rd_data.buff
+                received += 1
+
+        self._clear_control_signals()
+        self._propagate_control_signals()
+
+        self.log.debug(f"Read burst {drd[0: byte_count].hex()} from {addr.to_bytes(self.addr_width, 'little').hex()}")
+
+        return bytes(drd[0: byte_count])
+
 
 class MISlaveDriver(BusDriver):
     """Slave driver intended for the MI BUS that allows sending data to the read signals of the bus.
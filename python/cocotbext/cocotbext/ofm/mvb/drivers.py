@@ -8,6 +8,7 @@ from cocotbext.ofm.base.drivers import BusDriver
 from cocotbext.ofm.mvb.utils import random_delays_config
 
 import random
+from collections import deque
 
 
 class MVBDriver(BusDriver):
@@ -20,7 +21,19 @@ class MVBDriver(BusDriver):
        _word_width(int): width of MVB word in bytes.
        _item_width(int): width of MVB item in bytes.
        _item_offset(int): offset of MVB item in context of MVB word.
-
+       _schedule_words(int): number of words of the precomputed valid schedule, 0 for the item by item mode.
+       _schedule(deque): precomputed valid masks of the words, 0 for the whole invalid word.
+       _fill_template(bytes): cached content of the invalid items.
+
+    Precomputed schedule mode is enabled by "schedule_words" key of the mvb_params (optionally with "seed").
+    The valid masks of the next schedule_words words are generated at once from the same delay parameters
+    by a seeded generator, items are packed into whole words by slice assignment and invalid items keep
+    the content of the cached fill template. Unlike in the item by item mode, word delays are real
+    invalid words on the bus and the lengths of the gaps are random within the configured ranges.
+
+    In both modes, the idle words requested by the idle generator (set_idle_generator) are inserted before
+    the next word with data, e.g. RateLimiter for an exact throughput (with the random delays disabled
+    by ivgEnable_wt=0 and wordDelayEnable_wt=0).
     """
 
     _signals = ["data", "vld", "src_rdy", "dst_rdy"]
@@ -35,10 +48,47 @@ class MVBDriver(BusDriver):
         self._item_offset = 0
         self._clear_control_signals()
         self.bus.src_rdy.value = 0
+        self._cfg_update(bits_per_word=len(self.bus.data))
 
         self._cDelays, self._mode, self._delays_fill = random_delays_config(self._items, mvb_params)
         """Randomized empty spaces"""
 
+        self._schedule_words = mvb_params.get("schedule_words", 0)
+        self._schedule = deque()
+        self._rng = random.Random(mvb_params.get("seed"))
+        if self._mode == 2:
+            self._fill_template = self._rng.getrandbits(self._word_width * 8).to_bytes(self._word_width, "little")
+        else:
+            self._fill_template = bytes([self._delays_fill or 0]) * self._word_width
+
+    def _build_schedule(self) -> None:
+        """Precomputes valid masks of the next _schedule_words words."""
+
+        items = self._items
+        full = (1 << items) - 1
+        ivg_wt, word_delay_wt = self._cDelays["ivgEn_wt"], self._cDelays["wordDelayEn_wt"]
+        ivg, word_delay = self._cDelays["ivg"] or [0], self._cDelays["wordDelay"] or [0]
+        rng = self._rng
+
+        if not ivg_wt[1] and not word_delay_wt[1]:
+            self._schedule += [full] * self._schedule_words
+            return
+
+        gap = 0
+        for _ in range(self._schedule_words):
+            mask = 0
+            for pos in range(items):
+                if gap:
+                    gap -= 1
+                    continue
+                mask |= 1 << pos
+                if ivg_wt[1] and rng.choices((0, 1), weights=ivg_wt)[0]:
+                    gap = rng.choice(ivg)
+
+            self._schedule.append(mask)
+            if word_delay_wt[1] and rng.choices((0, 1), weights=word_delay_wt)[0]:
+                self._schedule += [0] * rng.choice(word_delay)
+
     def _clear_control_signals(self) -> None:
         """Sets control signals to default values without sending them to the MVB bus."""
 
@@ -137,6 +187,75 @@ class MVBDriver(BusDriver):
                 self._src_rdy = 1
                 self._item_cnt += 1
                 await self._move_item()
+                self._idle_gen.put(self._idle_tr, items=1)
+
+    async def _drive_idles(self, transaction) -> None:
+        """Drives invalid words requested by the idle generator before the next word with data."""
+
+        while True:
+            idle_count = self._idle_gen.get(transaction) // self._items
+            if idle_count == 0:
+                return
+
+            self.bus.vld.value = 0
+            self.bus.src_rdy.value = 0
+            for _ in range(idle_count):
+                await self._clk_re
+                self._idle_gen.put(self._idle_tr, items=self._items)
+
+    async def _send_scheduled(self) -> None:
+        """Sends all queued transactions word by word according to the precomputed schedule."""
+
+        item_width = self._item_width
+        data = bytearray(self._fill_template)
+
+        while self._sendQ:
+            if not self._schedule:
+                self._build_schedule()
+            mask = self._schedule.popleft()
+
+            if mask:
+                await self._drive_idles(self._sendQ[0][0])
+
+            if self._mode != 0:
+                data[:] = self._fill_template
+
+            done = []
+            vld = 0
+            for pos in range(self._items):
+                if not (mask >> pos) & 1:
+                    continue
+                if not self._sendQ:
+                    break
+
+                transaction, callback, event, kwargs = self._sendQ.popleft()
+                assert len(transaction) == item_width
+                data[pos * item_width:(pos + 1) * item_width] = transaction
+                vld |= 1 << pos
+                done.append((transaction, callback, event))
+
+            self.bus.data.value = int.from_bytes(data, 'little')
+            self.bus.vld.value = vld
+            self.bus.src_rdy.value = 1
+
+            while True:
+                await self._clk_re
+                if self.bus.dst_rdy.value == 1:
+                    break
+
+            self._item_cnt += self._items
+            self._vld_item_cnt += len(done)
+
+            for transaction, callback, event in done:
+                self._idle_gen.put(transaction, items=1, end=True)
+                if event:
+                    event.set()
+                if callback:
+                    callback(transaction)
+            self._idle_gen.put(self._idle_tr, items=self._items - len(done))
+
+        self.bus.vld.value = 0
+        self.bus.src_rdy.value = 0
 
     async def _send_thread(self) -> None:
         """Function used with cocotb testbench."""
@@ -146,10 +265,18 @@ class MVBDriver(BusDriver):
                 self._pending.clear()
                 await self._pending.wait()
 
+            await self._configure_idle_generator()
+            if self._schedule_words:
+                await self._send_scheduled()
+                continue
+
             while self._sendQ:
                 transaction, callback, event, kwargs = self._sendQ.popleft()
                 assert len(transaction) == self._item_width
+                if self._item_offset == 0:
+                    await self._drive_idles(transaction)
                 await self._send_data(transaction)
+                self._idle_gen.put(transaction, items=1, end=True)
                 if event:
                     event.set()
                 if callback:
@@ -4,6 +4,8 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import logging
+
 from cocotb_bus.monitors import BusMonitor
 from cocotb.triggers import RisingEdge
 
@@ -21,15 +23,32 @@ class MVBMonitor(BusMonitor):
         _items(int): number of MVB items.
         _word_width(int): width of MVB word in bytes.
         _item_width(int): width of MVB item in bytes.
+        _batch(list): items of the current word collected in the batch mode, None otherwise.
+
+    In the batch mode, items of each word are not passed to the callbacks one by one, but all at once
+    as a list to the callbacks added by add_batch_callback.
     """
     _signals = ["data", "vld", "src_rdy", "dst_rdy"]
 
-    def __init__(self, entity, name, clock, array_idx=None) -> None:
+    def __init__(self, entity, name, clock, array_idx=None, batch=False) -> None:
         super().__init__(entity, name, clock, array_idx=array_idx)
         self.item_cnt = 0
         self._items = len(self.bus.vld)
         self._word_width = len(self.bus.data) // 8  # width in bytes
         self._item_width = self._word_width // self._items
+        self._batch_mode = batch
+        self._batch = None
+        self._batch_callbacks = []
+
+    def add_batch_callback(self, callback) -> None:
+        """Adds function called with the list of items of each word in the batch mode."""
+        self._batch_callbacks.append(callback)
+
+    def _recv(self, transaction) -> None:
+        if self._batch is not None:
+            self._batch.append(transaction)
+        else:
+            super()._recv(transaction)
 
     def _is_valid_word(self, signal_src_rdy, signal_dst_rdy) -> bool:
         """Checks if the received word is valid transaction."""
@@ -39,7 +58,7 @@ class MVBMonitor(BusMonitor):
             return (signal_src_rdy.value == 1) and (signal_dst_rdy.value == 1)
 
     def receive_data(self, data, offset):
-        self._recv(data[offset*self._item_width:(offset+1)*self._item_width])
+        self._recv(bytes(data[offset*self._item_width:(offset+1)*self._item_width]))
 
     async def _monitor_recv(self) -> None:
         """Receive function used with cocotb testbench."""
@@ -55,17 +74,31 @@ class MVBMonitor(BusMonitor):
             if self._is_valid_word(self.bus.src_rdy, self.bus.dst_rdy):
                 data_val = self.bus.data.value
                 data_val.big_endian = False
-                data_bytes = data_val.buff
+                data_bytes = memoryview(data_val.buff)
 
-                vld = self.bus.vld.value
+                vld = self.bus.vld.value.integer
+                debug = self.log.isEnabledFor(logging.DEBUG)
 
-                for offset in range(self._items):
-                    if (vld[self._items-offset-1]):
-                        self.log.debug(f"ITEM {self.item_cnt}")
-                        self.log.debug(f"received item: {data_bytes[offset*self._item_width:(offset+1)*self._item_width]}")
-                        self.log.debug(f"word: {data_bytes}")
-                        self.log.debug(f"item vld: {vld[self._items-offset-1]}")
-                        self.log.debug(f"word vld: {vld}")
-                        self.receive_data(data_bytes, offset)
+                if self._batch_mode:
+                    self._batch = []
 
-                        self.item_cnt += 1
+                # iterate over the set bits of vld only, item 0 is the LSB
+                while vld:
+                    low = vld & -vld
+                    vld ^= low
+                    offset = low.bit_length() - 1
+
+                    if debug:
+                        self.log.debug(f"ITEM {self.item_cnt}")
+                        self.log.debug(f"received item: {bytes(data_bytes[offset*self._item_width:(offset+1)*self._item_width])}")
+                        self.log.debug(f"word: {bytes(data_bytes)}")
+                        self.log.debug(f"word vld: {self.bus.vld.value}")
+                    self.receive_data(data_bytes, offset)
+
+                    self.item_cnt += 1
+
+                if self._batch_mode:
+                    batch, self._batch = self._batch, None
+                    if batch:
+                        for callback in self._batch_callbacks:
+                            callback(batch)
@@ -1,9 +1,12 @@
 import cocotb
 import cocotb.queue
 from cocotb.triggers import Event, RisingEdge
+from cocotb.utils import get_sim_time
 
 from ..utils import concat, deconcat, SerializableHeader
+from ..utils.units import convert_units
 from .AvstRequester import AvstBase
+from .Axi4SCompleter import Axi4SCompleter
 
 
 class RequestHeaderEmpty(SerializableHeader):
@@ -29,9 +32,31 @@ class CompletionHeader(SerializableHeader):
 
 
 class AvstCompleter(AvstBase):
-    def __init__(self, cq_driver, cc_driver, cc_monitor):
+    """Completer side of the Intel P-Tile/R-Tile PCIe hard IP: sends requests on the CQ interface and receives completions on CC.
+
+    Reads and writes larger than MRRS/MPS are split into more requests which don't cross
+    the MRRS/MPS aligned boundary. All segments of a read are sent without waiting for their completions,
+    up to the outstanding window (number of tags in the tag pool). Completions can arrive in any order
+    and can be split into more completions, data of each read are returned in the order of the address.
+
+    Args:
+        mps: Max Payload Size in bytes, limits the size of one write request.
+        mrrs: Max Read Request Size in bytes, limits the size of one read request.
+        outstanding: maximal number of reads in flight (tags in the tag pool), 10-bit tags allow up to 1024.
+
+    Atributes:
+        read_bytes(int): number of bytes received by reads since the last clear_stats().
+        read_time(float): simulation time in ns with at least one read in flight since the last clear_stats().
+        reordered(int): number of completions received before a completion of an older request.
+    """
+
+    _segments = staticmethod(Axi4SCompleter._segments)
+
+    def __init__(self, cq_driver, cc_driver, cc_monitor, mps=256, mrrs=512, outstanding=32):
         super().__init__(cq_driver)
 
+        assert 0 < outstanding <= 2**10
+
         self._cq = cq_driver
         self._cc = cc_driver
         self._ccm = cc_monitor
@@ -39,25 +64,38 @@ class AvstCompleter(AvstBase):
         self._queue_recv = cocotb.queue.Queue()
         self._avst_width = len(self._cq.bus.DATA) // 8
 
+        self.mps = mps
+        self.mrrs = mrrs
+
         self._cc_inframe = None
         self._completions = {}
         self._read_requests = {}
         self._tag_queue = cocotb.queue.PriorityQueue()
-        [self._tag_queue.put_nowait(i) for i in range(2**5)]
+        [self._tag_queue.put_nowait(i) for i in range(outstanding)]
+
+        self._reads_inflight = 0
+        self._reads_start = 0
+        self.clear_stats()
 
         cc_monitor.add_callback(self._handle_cc_transaction)
         cocotb.start_soon(self._cq_loop())
 
+    def clear_stats(self):
+        self.read_bytes = 0
+        self.read_time = 0
+        self.reordered = 0
+        self._reads_start = get_sim_time("ns")
+
+    def read_throughput(self, out_units=None):
+        """Returns achieved host to card read throughput in b/s as (value, units) tuple, see convert_units."""
+        return convert_units(self.read_bytes * 8 / (self.read_time * 1e-9) if self.read_time else 0.0, "", out_units)
+
     async def _cq_loop(self):
         re = RisingEdge(self._cq.clock)
         await re
 
         while True:
-            if self._queue_send.empty():
-                await re
-                continue
-
-            item, trigger = self._queue_send.get_nowait()
+            item, trigger = await self._queue_send.get()
             tag = None
             if item[2] == 0:  # req_type=0 => read
                 tag = await self._tag_queue.get()
@@ -92,39 +130,63 @@ class AvstCompleter(AvstBase):
 
     def _handle_cc_transaction(self, transaction):
         header_bytes, data_bytes = transaction
-        hdr = CompletionHeader.deserialize(int.from_bytes(header_bytes, byteorder='big'))
-        data = list(data_bytes)
+        hdr = CompletionHeader.from_bytes(header_bytes, byteorder='big')
 
         # Process only if it is a completition (MI RD response)
         if hdr.tlp_type == int("0b01010", base=0) and (hdr.fmt) in [0, 2]:
 
             tag = concat([(hdr.tag_l, 8), (hdr.tag_m, 1), (hdr.tag_h, 1)])
 
+            # requests are stored in the order of sending
+            if tag != next(iter(self._read_requests)):
+                self.reordered += 1
+
             trigger, item, req_data = self._read_requests[tag]
             addr, byte_count, req_type, orig_data = item
-            offset = addr % 4
-            req_data = data[offset:byte_count + offset]
+
+            # The request can be completed by more completions, only the first one starts at the address offset
+            data = data_bytes[:hdr.dwords * 4] if hdr.dwords else data_bytes
+            offset = addr % 4 if not req_data else 0
+            req_data += data[offset:offset + byte_count - len(req_data)]
             # firstBe = [0xF, 0xE, 0xC, 0x8][addr % 4]
             # lastBe = [0xF, 0x1, 0x3, 0x7][(addr + byte_count) % 4]
-            # fixme: BE & length & completed = 0
 
-            del self._read_requests[tag]
-            trigger.set(req_data)
-            self._tag_queue.put_nowait(tag)
+            if len(req_data) >= byte_count:
+                del self._read_requests[tag]
+                trigger.set(req_data)
+                self._tag_queue.put_nowait(tag)
 
     async def read(self, addr, byte_count) -> bytes:
-        # TODO: split big reads to more transactions
-        e = Event()
-        await self._queue_send.put(((addr, byte_count, 0, []), e))
-        await e.wait()
-        return bytes(e.data)
+        if self._reads_inflight == 0:
+            self._reads_start = get_sim_time("ns")
+        self._reads_inflight += 1
+
+        events = []
+        for seg_addr, seg_count in self._segments(addr, byte_count, self.mrrs):
+            e = Event()
+            events.append(e)
+            await self._queue_send.put(((seg_addr, seg_count, 0, []), e))
+
+        data = bytearray()
+        for e in events:
+            await e.wait()
+            data += bytes(e.data)
+
+        self._reads_inflight -= 1
+        self.read_bytes += len(data)
+        if self._reads_inflight == 0:
+            self.read_time += get_sim_time("ns") - self._reads_start
+        return bytes(data)
 
     async def write(self, addr, data: bytes):
-        # TODO: split big writes to more transactions
-        e = Event()
         data = list(data)
-        await self._queue_send.put(((addr, len(data), 1, data), e))
-        data = await e.wait()
+        e = None
+        pos = 0
+        for seg_addr, seg_count in self._segments(addr, len(data), self.mps):
+            e = Event()
+            await self._queue_send.put(((seg_addr, seg_count, 1, data[pos:pos + seg_count]), e))
+            pos += seg_count
+        await e.wait()
 
     async def read64(self, addr):
         rawdata = await self.read(addr, 8)
@@ -2,6 +2,7 @@ import cocotb
 from cocotb.queue import Queue
 
 from ..utils import concat, deconcat, SerializableHeader
+from .HostMemoryModel import HostMemoryModel
 
 
 class CompletionHeaderEmpty(SerializableHeader):
@@ -77,7 +78,14 @@ class AvstBase:
 
 
 class AvstRequester(AvstBase):
-    def __init__(self, ram, rq_driver, rc_driver, rq_monitor):
+    """Requester side of the Intel P-Tile/R-Tile PCIe hard IP: serves requests from the RQ interface with RAM and sends completions on RC.
+
+    Args:
+        host: HostMemoryModel with the read latency, RCB split of completions, credits and bandwidth cap.
+              By default, each read is completed immediately with one completion.
+    """
+
+    def __init__(self, ram, rq_driver, rc_driver, rq_monitor, host=None):
         super().__init__(rc_driver)
 
         self._verbosity = 0
@@ -85,6 +93,7 @@ class AvstRequester(AvstBase):
         self._rq = rq_driver
         self._rc = rc_driver
         self._rqm = rq_monitor
+        self._host = host or HostMemoryModel()
 
         self._q = Queue()
         self._rq_processing_frame = False
@@ -98,9 +107,8 @@ class AvstRequester(AvstBase):
         cocotb.start_soon(self.handle_response())
 
     def handle_rq_transaction(self, transaction):
-        header_bytes, data_bytes = transaction
-        data = list(data_bytes)
-        hdr = RequestHeader.deserialize(int.from_bytes(header_bytes, byteorder="big"))
+        header_bytes, data = transaction
+        hdr = RequestHeader.from_bytes(header_bytes, byteorder="big")
 
         # Process only if it is a request (DMA WR or RD)
         if hdr.tlp_type == 0 and hdr.req_type in [0, 1]:
@@ -108,7 +116,6 @@ class AvstRequester(AvstBase):
 
     def handle_request(self, req):
         header, payload = req
-        byte_count = header.dwords * 4
 
         if header.addr_len == 0: # 32-bit address
             addr_h, addr_l = deconcat([header.addr, 32, 32])
@@ -119,32 +126,48 @@ class AvstRequester(AvstBase):
         if header.req_type == 1: # write
             self._ram.w(addr, payload)
             if self._verbosity:
-                print(type(self).__name__, "Write addr:", hex(addr), "dwords:", header.dwords, "payload:", payload)
+                print(type(self).__name__, "Write addr:", hex(addr), "dwords:", header.dwords, "payload:", list(payload))
         elif header.req_type == 0: # read
-            d = self._ram.r(addr, byte_count)
             if self._verbosity:
-                print(type(self).__name__, "Read addr:", hex(addr), "dwords:", header.dwords, "payload:", list(d))
-            self._q.put_nowait((header, d))
+                print(type(self).__name__, "Read addr:", hex(addr), "dwords:", header.dwords)
+            self._q.put_nowait((header, addr))
 
     async def handle_response(self):
+        cocotb.start_soon(self._host.run(self._send_completion))
         while True:
-            rq_hdr, data = await self._q.get()
-            rq_fbe = rq_hdr.fbe
-
-            header_empty = CompletionHeaderEmpty()
-            header = CompletionHeader()
-            header.tag_l, header.tag_m, header.tag_h = rq_hdr.tag_l, rq_hdr.tag_m, rq_hdr.tag_h
-            header.fmt = int("010", base=2) # Completition with data: "010", Completition withOUT data: "000"
-            header.tlp_type = int("01010", base=2) # Completion for LOCKED Memory Read: "01011" (with/without data)
-            header.dwords = rq_hdr.dwords
-            # 15.bit_count() # only in Python 3.10 and newer can be used below
-            # TODO: Check IO and CFG transfers
-            header.byte_cnt = (
-                header.dwords * 4
-                - (4 - numberOfSetBits(rq_fbe))
-                - ((4 - numberOfSetBits(rq_fbe)) if header.dwords > 1 else 0)
-            )
-            header.compl_stat = 1
-            # WTF is this?
-            header.low_addr = 0  # Info: increment for each consequent completion
-            await self._send_frame(self._cdriver.write_rc, data, header, header_empty)
+            rq_hdr, addr = await self._q.get()
+            await self._host.request(addr, rq_hdr.dwords * 4, (rq_hdr, addr))
+
+    async def _send_completion(self, item, cpl_addr, byte_count, last):
+        """Sends completion with byte_count bytes (whole DWORDs) of the read request data from the cpl_addr.
+
+        The data are read from the RAM when the completion is sent.
+        """
+        rq_hdr, addr = item
+        rq_fbe, rq_lbe = rq_hdr.fbe, rq_hdr.lbe
+        offset = cpl_addr - addr
+        # offset of the first enabled byte in the first DWORD
+        first = (rq_fbe & -rq_fbe).bit_length() - 1 if rq_fbe else 0
+
+        header_empty = CompletionHeaderEmpty()
+        header = CompletionHeader()
+        header.tag_l, header.tag_m, header.tag_h = rq_hdr.tag_l, rq_hdr.tag_m, rq_hdr.tag_h
+        header.fmt = int("010", base=2) # Completition with data: "010", Completition withOUT data: "000"
+        header.tlp_type = int("01010", base=2) # Completion for LOCKED Memory Read: "01011" (with/without data)
+        header.dwords = byte_count // 4
+        # 15.bit_count() # only in Python 3.10 and newer can be used below
+        # TODO: Check IO and CFG transfers
+        # Byte count of the whole request minus bytes sent by the previous completions
+        header.byte_cnt = (
+            rq_hdr.dwords * 4
+            - (4 - numberOfSetBits(rq_fbe))
+            - ((4 - numberOfSetBits(rq_lbe)) if rq_hdr.dwords > 1 else 0)
+            - (offset - first if offset else 0)
+        )
+        header.compl_stat = 1
+        # Lower 7 bits of the address of the first byte in the completion
+        header.low_addr = cpl_addr + (0 if offset else first)
+        data = self._ram.r(cpl_addr, byte_count)
+        if self._verbosity:
+            print(type(self).__name__, "Read data:", hex(cpl_addr), "payload:", list(data))
+        await self._send_frame(self._cdriver.write_rc, data, header, header_empty)
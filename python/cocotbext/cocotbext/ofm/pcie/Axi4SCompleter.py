@@ -1,8 +1,10 @@
 import cocotb
 import cocotb.queue
 from cocotb.triggers import Event, RisingEdge
+from cocotb.utils import get_sim_time
 
 from ..utils import concat, SerializableHeader
+from ..utils.units import convert_units
 
 
 class RequestHeaderEmpty(SerializableHeader):
@@ -42,7 +44,22 @@ class CompletionHeader(SerializableHeader):
 
 
 class Axi4SCompleter:
-    def __init__(self, cq_driver, cc_driver, cc_monitor):
+    """Completer side of the Xilinx PCIe hard IP: sends requests on the CQ interface and receives completions on CC.
+
+    Reads and writes larger than MRRS/MPS are split into more requests which don't cross
+    the MRRS/MPS aligned boundary. All segments of a read are sent without waiting for their completions,
+    so up to 32 reads (number of tags) can be in flight at once.
+
+    Args:
+        mps: Max Payload Size in bytes, limits the size of one write request.
+        mrrs: Max Read Request Size in bytes, limits the size of one read request.
+
+    Atributes:
+        read_bytes(int): number of bytes received by reads since the last clear_stats().
+        read_time(float): simulation time in ns with at least one read in flight since the last clear_stats().
+    """
+
+    def __init__(self, cq_driver, cc_driver, cc_monitor, mps=256, mrrs=512):
         self._cq = cq_driver
         self._cc = cc_driver
         self._ccm = cc_monitor
@@ -50,25 +67,37 @@ class Axi4SCompleter:
         self._queue_recv = cocotb.queue.Queue()
         self._axi_width = len(self._cq.bus.TDATA) // 8
 
+        self.mps = mps
+        self.mrrs = mrrs
+
         self._cc_inframe = None
         self._completions = {}
         self._read_requests = {}
         self._tag_queue = cocotb.queue.PriorityQueue()
         [self._tag_queue.put_nowait(i) for i in range(2**5)]
 
+        self._reads_inflight = 0
+        self._reads_start = 0
+        self.clear_stats()
+
         cc_monitor.add_callback(self._handle_cc_transaction)
         cocotb.start_soon(self._cq_loop())
 
+    def clear_stats(self):
+        self.read_bytes = 0
+        self.read_time = 0
+        self._reads_start = get_sim_time("ns")
+
+    def read_throughput(self, out_units=None):
+        """Returns achieved host to card read throughput in b/s as (value, units) tuple, see convert_units."""
+        return convert_units(self.read_bytes * 8 / (self.read_time * 1e-9) if self.read_time else 0.0, "", out_units)
+
     async def _cq_loop(self):
         re = RisingEdge(self._cq.clock)
         await re
 
         while True:
-            if self._queue_send.empty():
-                await re
-                continue
-
-            item, trigger = self._queue_send.get_nowait()
+            item, trigger = await self._queue_send.get()
             tag = None
             if item[2] == 0:  # req_type = read
                 tag = await self._tag_queue.get()
@@ -78,6 +107,18 @@ class Axi4SCompleter:
 
             await self._cq_req(*item, tag=tag, sync=False)
 
+    @staticmethod
+    def _segments(addr, byte_count, size):
+        """Splits the address range into (addr, byte_count) segments which don't cross the size aligned boundary."""
+        segments = []
+        while True:
+            cnt = min(byte_count, size - addr % size)
+            segments.append((addr, cnt))
+            addr += cnt
+            byte_count -= cnt
+            if byte_count <= 0:
+                return segments
+
     def _handle_cc_transaction(self, tr):
         data = list(reversed(tr["TDATA"]))
         # FIXME: Monitor sends values as bytes
@@ -85,7 +126,7 @@ class Axi4SCompleter:
         if self._cc_inframe is None:
             h = len(CompletionHeader()) // 8
             hdrbytes, data = data[:h], data[h:]
-            self._cc_inframe = CompletionHeader.deserialize(int.from_bytes(hdrbytes, byteorder='little'))
+            self._cc_inframe = CompletionHeader.from_bytes(hdrbytes)
 
         hdr = self._cc_inframe
 
@@ -144,18 +185,36 @@ class Axi4SCompleter:
             data = data[cnt:]
 
     async def read(self, addr: int, byte_count: int) -> bytes:
-        # TODO: split big reads to more transactions
-        e = Event()
-        await self._queue_send.put(((addr, byte_count, 0, []), e))
-        await e.wait()
-        return bytes(e.data)
+        if self._reads_inflight == 0:
+            self._reads_start = get_sim_time("ns")
+        self._reads_inflight += 1
+
+        events = []
+        for seg_addr, seg_count in self._segments(addr, byte_count, self.mrrs):
+            e = Event()
+            events.append(e)
+            await self._queue_send.put(((seg_addr, seg_count, 0, []), e))
+
+        data = bytearray()
+        for e in events:
+            await e.wait()
+            data += bytes(e.data)
+
+        self._reads_inflight -= 1
+        self.read_bytes += len(data)
+        if self._reads_inflight == 0:
+            self.read_time += get_sim_time("ns") - self._reads_start
+        return bytes(data)
 
     async def write(self, addr: int, data: bytes):
-        # TODO: split big writes to more transactions
-        e = Event()
         data = list(data)
-        await self._queue_send.put(((addr, len(data), 1, data), e))
-        data = await e.wait()
+        e = None
+        pos = 0
+        for seg_addr, seg_count in self._segments(addr, len(data), self.mps):
+            e = Event()
+            await self._queue_send.put(((seg_addr, seg_count, 1, data[pos:pos + seg_count]), e))
+            pos += seg_count
+        await e.wait()
 
     async def read64(self, addr):
         rawdata = await self.read(addr, 8)
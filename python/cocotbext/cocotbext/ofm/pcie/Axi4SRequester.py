@@ -5,6 +5,7 @@ import cocotb
 from cocotb.queue import Queue
 
 from ..utils import concat, SerializableHeader
+from .HostMemoryModel import HostMemoryModel
 
 
 def byte_serialize(data, length):
@@ -83,13 +84,36 @@ class Frame(object):
         return self
 
 
+class ByteFrame(object):
+    """Frame assembled from little-endian byte buffers instead of one big integer."""
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.data = bytearray()
+
+    def append(self, data, dwords):
+        self.data += data[:dwords * 4]
+        return self
+
+
 class Axi4SRequester:
-    def __init__(self, ram, rq_driver, rc_driver, rq_monitor):
+    """Requester side of the Xilinx PCIe hard IP: serves requests from the RQ interface with RAM and sends completions on RC.
+
+    Args:
+        byte_buffers: process the transactions as byte buffers (memoryview slices, no per-byte lists).
+                      When False, each beat is processed as one big integer.
+        host: HostMemoryModel with the read latency, RCB split of completions, credits and bandwidth cap.
+              By default, each read is completed immediately with one completion.
+    """
+
+    def __init__(self, ram, rq_driver, rc_driver, rq_monitor, byte_buffers=True, host=None):
         self._verbosity = 0
         self._ram = ram
         self._rq = rq_driver
         self._rc = rc_driver
         self._rcm = rq_monitor
+        self._byte_buffers = byte_buffers
+        self._host = host or HostMemoryModel()
 
         self._q = Queue()
         self._rq_inframe = False
@@ -104,8 +128,14 @@ class Axi4SRequester:
         cocotb.start_soon(self.handle_response())
 
     def handle_rq_transaction(self, transaction):
-        tuser = RqUser.deserialize(int.from_bytes(transaction['TUSER'], byteorder='big'))
-        tdata = int.from_bytes(transaction['TDATA'], byteorder='big')
+        tuser = RqUser.from_bytes(transaction['TUSER'], byteorder='big')
+
+        if self._byte_buffers:
+            tdata = memoryview(transaction['TDATA'][::-1])
+            new_frame, data_at = ByteFrame, lambda sop: tdata[sop * (self._rq_width // 32):]
+        else:
+            tdata = int.from_bytes(transaction['TDATA'], byteorder='big')
+            new_frame, data_at = Frame, lambda sop: tdata >> (sop * (self._rq_width // (2**2)))
 
         sop_pos = [getattr(tuser, 'sop{:d}'.format(i)) for i in range(bin(tuser.sop).count("1"))]
         eop_pos = [getattr(tuser, 'eop{:d}'.format(i)) for i in range(bin(tuser.eop).count("1"))]
@@ -115,16 +145,16 @@ class Axi4SRequester:
 
         if self._rq_inframe:
             if eop_pos:
-                self.handle_request(self._rq_inframe.append(tdata, eop_pos[0] + 1))
+                self.handle_request(self._rq_inframe.append(data_at(0), eop_pos[0] + 1))
                 self._rq_inframe = None
                 eop_pos.pop(0)
             else:
-                self._rq_inframe.append(tdata, 16)
+                self._rq_inframe.append(data_at(0), 16)
 
         while sop_pos:
             meta = (fbe.pop(0), lbe.pop(0), addr_off.pop(0))
             dwords = (eop_pos[0] if eop_pos else (self._rq_width // 32 - 1)) - sop_pos[0] * 4 + 1
-            self._rq_inframe = Frame(meta).append(tdata >> (sop_pos[0] * (self._rq_width // (2**2))), dwords)
+            self._rq_inframe = new_frame(meta).append(data_at(sop_pos[0]), dwords)
             if eop_pos:
                 self.handle_request(self._rq_inframe)
                 self._rq_inframe = None
@@ -133,8 +163,13 @@ class Axi4SRequester:
 
     def handle_request(self, req):
         fbe, lbe, addr_offset = req.meta
-        header = RequestHeader.deserialize(req.data)
-        payload = byte_serialize(req.data >> len(header), header.dword_count * 4)
+        if isinstance(req, ByteFrame):
+            hdr_len = len(RequestHeader()) // 8
+            header = RequestHeader.from_bytes(req.data[:hdr_len])
+            payload = memoryview(req.data)[hdr_len: hdr_len + header.dword_count * 4]
+        else:
+            header = RequestHeader.deserialize(req.data)
+            payload = byte_serialize(req.data >> len(header), header.dword_count * 4)
 
         addr = header.addr << 2
         byte_count = header.dword_count * 4
@@ -142,50 +177,86 @@ class Axi4SRequester:
         if header.type == 1:
             self._ram.w(addr, payload)
             if self._verbosity:
-                print(type(self).__name__, "Write addr:", hex(addr), "dword_count:", header.dword_count, "payload:", payload)
+                print(type(self).__name__, "Write addr:", hex(addr), "dword_count:", header.dword_count, "payload:", list(payload))
             return
 
         elif header.type == 0:
-            d = self._ram.r(addr, byte_count)
             if self._verbosity:
-                print(type(self).__name__, "Read  addr:", hex(addr), "dword_count:", header.dword_count, header.tag, "payload:", list(d))
-            self._q.put_nowait((header, req.meta, d))
-
-    async def handle_response(self):
-        while True:
-            request, req_meta, data = await self._q.get()
-            req_fbe, req_lbe, req_addr_offset = req_meta
-            dword_count = request.dword_count + 3
-
-            header = CompletionHeader()
-            header.tag = request.tag
-            header.dword_count = request.dword_count
-            # 15.bit_count() # only in Python 3.10 and newer can be used below
-            # TODO: Check IO and CFG transfers
-            header.bytes = (
-                request.dword_count * 4
-                - (4 - numberOfSetBits(req_fbe))
-                - ((4 - numberOfSetBits(req_fbe)) if request.dword_count > 1 else 0)
-            )
-            header.request_completed = 1
-            header.addr = 0  # Info: increment for each consequent completion
-            user = RcUser()
-            user.sop = 1
-            user.eop = 0
-            user.eop0 = dword_count - 1
-
-            tdata = concat(
+                print(type(self).__name__, "Read  addr:", hex(addr), "dword_count:", header.dword_count, header.tag)
+            self._q.put_nowait((header, req.meta))
+
+    def completion_words(self, request, req_meta, data=None, offset=0, byte_count=None):
+        """Returns list of RC interface words with the completion of the read request.
+
+        The request can be completed by more completions, each of them carries byte_count bytes (whole DWORDs)
+        of the data from the offset. By default, one completion carries all the data. Data of the whole request
+        can be passed, otherwise the data of the completion are read from the RAM now.
+        """
+        req_fbe, req_lbe, req_addr_offset = req_meta
+        if byte_count is None:
+            byte_count = request.dword_count * 4
+        if data is None:
+            data = self._ram.r((request.addr << 2) + offset, byte_count)
+            if self._verbosity:
+                print(type(self).__name__, "Read  data:", hex((request.addr << 2) + offset), request.tag, "payload:", list(data))
+        else:
+            data = data[offset:offset + byte_count]
+        dword_count = byte_count // 4 + 3
+
+        # offset of the first enabled byte in the first DWORD
+        first = (req_fbe & -req_fbe).bit_length() - 1 if req_fbe else 0
+
+        header = CompletionHeader()
+        header.tag = request.tag
+        header.dword_count = byte_count // 4
+        # 15.bit_count() # only in Python 3.10 and newer can be used below
+        # TODO: Check IO and CFG transfers
+        # Byte count of the whole request minus bytes sent by the previous completions
+        header.byte_count = (
+            request.dword_count * 4
+            - (4 - numberOfSetBits(req_fbe))
+            - ((4 - numberOfSetBits(req_lbe)) if request.dword_count > 1 else 0)
+            - (offset - first if offset else 0)
+        )
+        header.request_completed = int(offset + byte_count >= request.dword_count * 4)
+        header.addr = (request.addr << 2) + (offset if offset else first)
+        user = RcUser()
+        user.sop = 1
+        user.eop = 0
+        user.eop0 = dword_count - 1
+
+        if self._byte_buffers:
+            width = self._rq_width // 8
+            buf = memoryview(header.to_bytes() + bytes(data))
+            beat = (lambda: int.from_bytes(buf[:width], byteorder='little'))
+        else:
+            width = self._rq_width
+            buf = concat(
                 [(header.serialize(), len(header))]
                 + [(byte_deserialize(data), len(data) * 8)]
             )
-            while dword_count > 0:
-                tkeep = bm(self._rq_width // 32)
-                if dword_count < self._rq_width // 32:
-                    user.eop = 1
-                    user.eop_pos0 = dword_count
-                    tkeep = bm(dword_count)
-                await self._rc.write({"TDATA": tdata & bm(self._rq_width), "TUSER": user.serialize(), "TKEEP": tkeep}, sync=False)
-
-                user.sop = 0
-                tdata >>= self._rq_width
-                dword_count -= self._rq_width // 32
+            beat = (lambda: buf & bm(self._rq_width))
+
+        words = []
+        while dword_count > 0:
+            tkeep = bm(self._rq_width // 32)
+            if dword_count < self._rq_width // 32:
+                user.eop = 1
+                tkeep = bm(dword_count)
+            words.append({"TDATA": beat(), "TUSER": user.serialize(), "TKEEP": tkeep})
+
+            user.sop = 0
+            buf = buf[width:] if self._byte_buffers else buf >> width
+            dword_count -= self._rq_width // 32
+        return words
+
+    async def handle_response(self):
+        cocotb.start_soon(self._host.run(self._send_completion))
+        while True:
+            request, req_meta = await self._q.get()
+            await self._host.request(request.addr << 2, request.dword_count * 4, (request, req_meta))
+
+    async def _send_completion(self, item, addr, byte_count, last):
+        request, req_meta = item
+        for word in self.completion_words(request, req_meta, None, addr - (request.addr << 2), byte_count):
+            await self._rc.write(word, sync=False)
@@ -0,0 +1,121 @@
+# HostMemoryModel.py: Timing model of the host memory serving PCIe reads
+# Copyright (C) 2024 CESNET z. s. p. o.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import random
+
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import Timer
+from cocotb.utils import get_sim_steps, get_sim_time
+
+from ..utils.histogram import Histogram
+
+
+class HostMemoryModel:
+    """Timing model of the host side of the PCIe link, which decides when and how the read requests are completed.
+
+    Each accepted read request is delayed by the read latency and then completed by one or more completions,
+    which are split at the RCB (Read Completion Boundary) aligned addresses. Completions of different requests
+    are sent in the order in which their requests became ready, so with a random latency they can be reordered.
+    The default model completes each read immediately with one completion. Each requester needs its own model.
+
+    Args:
+        latency: read latency in ns: number (constant latency), (low, high) range of uniformly distributed
+                 random latencies, or function without arguments returning the latency.
+        rcb: Read Completion Boundary in bytes (64 or 128), None for no splitting.
+        max_payload: maximal payload of one completion in bytes, multiple of the RCB (the RCB by default).
+        bandwidth: completion bandwidth cap in Gb/s, which includes the overhead of each completion, None for no cap.
+        overhead: bytes of the TLP header and the link layer framing added to each completion by the bandwidth cap.
+        credits: maximal number of read requests being served at once (non-posted credits), 0 for unlimited.
+                 Further requests wait in the requester until the last completion of an older request is sent.
+        seed: seed of the random latencies.
+
+    Atributes:
+        latency(Histogram): time in ns from the acceptance of the request to the sending of its last completion.
+        completions(int): number of sent completions.
+    """
+
+    def __init__(self, latency=0, rcb=None, max_payload=None, bandwidth=None, overhead=20, credits=0, seed=None):
+        assert rcb is None or max_payload is None or max_payload % rcb == 0, "max_payload must be a multiple of RCB"
+
+        self._latency = latency
+        self.rcb = rcb
+        self.max_payload = max_payload or rcb
+        self.bandwidth = bandwidth
+        self.overhead = overhead
+        self._rng = random.Random(seed)
+
+        self._credits = Queue(maxsize=credits)
+        self._ready = Queue()
+        self._next_time = 0
+
+        self.latency = Histogram()
+        self.completions = 0
+
+    def _sample_latency(self):
+        if callable(self._latency):
+            return self._latency()
+        if isinstance(self._latency, (tuple, list)):
+            return self._rng.uniform(*self._latency)
+        return self._latency
+
+    def split(self, addr, byte_count):
+        """Splits the read of DWORD aligned address range into (addr, byte_count) of its completions."""
+        if not self.rcb:
+            return [(addr, byte_count)]
+
+        completions = []
+        while byte_count > 0:
+            cnt = min(byte_count, self.max_payload - addr % self.rcb)
+            completions.append((addr, cnt))
+            addr += cnt
+            byte_count -= cnt
+        return completions
+
+    async def request(self, addr, byte_count, item):
+        """Accepts the read request, waits for a free credit.
+
+        The item (requester specific description of the request) is passed back to the send function of the run
+        coroutine together with the address and the byte count of each completion.
+        """
+        await self._credits.put(None)
+
+        start = get_sim_time("ns")
+        completions = self.split(addr, byte_count)
+        latency = self._sample_latency()
+        if latency:
+            cocotb.start_soon(self._delay(latency, item, completions, start))
+        else:
+            self._enqueue(item, completions, start)
+
+    async def _delay(self, latency, item, completions, start):
+        steps = get_sim_steps(latency, "ns", round_mode="round")
+        if steps:
+            await Timer(steps, "step")
+        self._enqueue(item, completions, start)
+
+    def _enqueue(self, item, completions, start):
+        for i, (addr, byte_count) in enumerate(completions):
+            self._ready.put_nowait((item, addr, byte_count, i == len(completions) - 1, start))
+
+    async def run(self, send):
+        """Sends the ready completions by calling await send(item, addr, byte_count, last)."""
+        while True:
+            item, addr, byte_count, last, start = await self._ready.get()
+
+            if self.bandwidth:
+                now = get_sim_time("ns")
+                if self._next_time > now:
+                    steps = get_sim_steps(self._next_time - now, "ns", round_mode="ceil")
+                    if steps:
+                        await Timer(steps, "step")
+                self._next_time = max(now, self._next_time) + (byte_count + self.overhead) * 8 / self.bandwidth
+
+            await send(item, addr, byte_count, last)
+            self.completions += 1
+
+            if last:
+                self._credits.get_nowait()
+                self.latency.add(get_sim_time("ns") - start)
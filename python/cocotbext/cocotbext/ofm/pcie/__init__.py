@@ -8,5 +8,8 @@ from .Axi4SRequester import Axi4SRequester
 from .AvstCompleter import AvstCompleter
 from .AvstRequester import AvstRequester
 
+# Timing model of the host memory for the requesters
+from .HostMemoryModel import HostMemoryModel
 
-__all__ = ["Axi4SCompleter", "Axi4SRequester", "AvstCompleter", "AvstRequester"]
+
+__all__ = ["Axi4SCompleter", "Axi4SRequester", "AvstCompleter", "AvstRequester", "HostMemoryModel"]
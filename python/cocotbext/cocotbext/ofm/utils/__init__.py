@@ -1,4 +1,4 @@
 from .header import SerializableHeader, concat, deconcat
-from .ram import RAM
+from .ram import RAM, SparseRAM
 
-__all__ = ["SerializableHeader", "concat", "deconcat", "RAM"]
+__all__ = ["SerializableHeader", "concat", "deconcat", "RAM", "SparseRAM"]
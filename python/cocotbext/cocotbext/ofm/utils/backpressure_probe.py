@@ -0,0 +1,196 @@
+# backpressure_probe.py: Probe for measuring backpressure and occupancy of a bus
+# Copyright (C) 2024 CESNET z. s. p. o.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import cocotb
+from cocotb.utils import get_sim_time
+from cocotbext.ofm.base.probe import Probe, ProbeInterface
+from cocotbext.ofm.utils.histogram import Histogram
+
+
+class BackpressureProbeInterface(ProbeInterface):
+    """
+    Base class for interfacing between backpressure probe and BusMonitor object. Children implement
+    the src_rdy and dst_rdy properties returning the current state of the handshake signals as bool.
+    """
+    interface_dict = {
+        "clock"   : "clock",
+        "in_reset": "in_reset",
+    }
+
+    @property
+    def src_rdy(self) -> bool:
+        raise NotImplementedError()
+
+    @property
+    def dst_rdy(self) -> bool:
+        raise NotImplementedError()
+
+
+class BackpressureProbeMvbInterface(BackpressureProbeInterface):
+    """Backpressure probe interface for the MVB monitor."""
+
+    @property
+    def src_rdy(self) -> bool:
+        return self._monitor.bus.src_rdy.value == 1
+
+    @property
+    def dst_rdy(self) -> bool:
+        return self._monitor.bus.dst_rdy.value == 1
+
+
+class BackpressureProbeMfbInterface(BackpressureProbeMvbInterface):
+    """Backpressure probe interface for the MFB monitor."""
+    pass
+
+
+class BackpressureProbeAxi4StreamInterface(BackpressureProbeInterface):
+    """Backpressure probe interface for the AXI4-Stream monitor."""
+
+    @property
+    def src_rdy(self) -> bool:
+        return self._monitor.bus.TVALID.value == 1
+
+    @property
+    def dst_rdy(self) -> bool:
+        return self._monitor.bus.TREADY.value == 1
+
+
+class BackpressureProbeLBusInterface(BackpressureProbeInterface):
+    """
+    Backpressure probe interface for the LBUS monitor. Source is ready when any segment is enabled.
+    The LBUS monitor has no ready signal, pass it as rdy (e.g. dut.TX_RDY), otherwise the sink is always ready.
+    """
+
+    def __init__(self, monitor, rdy=None):
+        super().__init__(monitor)
+        self._rdy = rdy
+
+    @property
+    def src_rdy(self) -> bool:
+        return self._monitor.bus.ena.value.integer != 0
+
+    @property
+    def dst_rdy(self) -> bool:
+        return self._rdy is None or self._rdy.value == 1
+
+
+class BackpressureStats:
+    """
+    Counters of the handshake states.
+
+    Atributes:
+        cycles(int): number of sampled clock cycles.
+        transfer(int): cycles with src_rdy and dst_rdy (data transferred).
+        blocked(int): cycles with src_rdy and without dst_rdy (source ready, blocked by the sink).
+        idle(int): cycles without src_rdy (source has no data).
+        longest_stall(int): the longest run of consecutive blocked cycles, including the ongoing one.
+        ongoing_stall(int): length of the run of blocked cycles which hasn't ended yet, 0 when not blocked.
+        stall_lengths(Histogram): lengths of the ended runs of consecutive blocked cycles.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.cycles = 0
+        self.transfer = 0
+        self.blocked = 0
+        self.idle = 0
+        self.longest_stall = 0
+        self.ongoing_stall = 0
+        self.stall_lengths = Histogram()
+
+    def stalled(self, length: int) -> None:
+        self.ongoing_stall = length
+        if length > self.longest_stall:
+            self.longest_stall = length
+
+    def stall_ended(self, length: int) -> None:
+        self.stall_lengths.add(length)
+        self.longest_stall = max(self.longest_stall, length)
+        self.ongoing_stall = 0
+
+    def __str__(self) -> str:
+        if not self.cycles:
+            return "no cycles sampled"
+
+        return (
+            f"transfer: {self.transfer / self.cycles * 100:.2f}%, blocked by sink: {self.blocked / self.cycles * 100:.2f}%, "
+            f"idle source: {self.idle / self.cycles * 100:.2f}%, longest stall: {self.longest_stall} cycles, "
+            f"stalls: {self.stall_lengths.summary('{:.1f}')}"
+            + (f", ongoing stall: {self.ongoing_stall} cycles" if self.ongoing_stall else "")
+        )
+
+
+class BackpressureProbe(Probe):
+    """
+    Probe for measuring where the throughput is lost: samples src_rdy and dst_rdy each clock cycle and counts
+    cycles of transfer, cycles blocked by the sink (backpressure) and cycles idle on the source side.
+
+    Atributes:
+        stats(BackpressureStats): counters of the whole simulation.
+        period_stats(BackpressureStats): counters of the current log period.
+        _stall(int): length of the current run of blocked cycles.
+
+    Usage:
+        - Create the probe with the interface for the probed bus, e.g.
+          BackpressureProbe(BackpressureProbeMfbInterface(tb.stream_out)).
+
+        - Optionally set the log intervals and period like with the ThroughputProbe (add_log_interval, set_log_period).
+          Counters of each period are logged at the period ticks.
+
+        - Call log_backpressure at the end of the test for the counters of the whole simulation.
+    """
+    def __init__(self, interface: BackpressureProbeInterface = None, period: int = 0, time_units: str = "us", log_intervals: list = [], callback=None):
+        self.stats = BackpressureStats()
+        self.period_stats = BackpressureStats()
+        self._stall = 0
+        super().__init__(interface, period, time_units, log_intervals, callback)
+
+    def log_backpressure(self) -> None:
+        """Prints out counters of the whole simulation."""
+        self.log.info(f"Backpressure: {self.stats}")
+
+    def _interval_started(self) -> None:
+        self.period_stats.clear()
+
+    def _period_elapsed(self) -> None:
+        self.log.info(f"Backpressure at {get_sim_time(units=self._format_units_for_get_sim_time(self._time_units))} {self._time_units}: {self.period_stats}")
+        self.period_stats.clear()
+
+    async def _start_probe(self) -> None:
+        """Samples the handshake each clock cycle, logging is done by the log intervals scheduler."""
+        cocotb.start_soon(self._run_schedule())
+
+        stats, period_stats = self.stats, self.period_stats
+        while True:
+            await self._clk_re
+
+            if self._interface.in_reset:
+                continue
+
+            src_rdy = self._interface.src_rdy
+            blocked = src_rdy and not self._interface.dst_rdy
+            in_period = self._active is not None
+
+            for s in (stats, period_stats) if in_period else (stats,):
+                s.cycles += 1
+                if blocked:
+                    s.blocked += 1
+                elif src_rdy:
+                    s.transfer += 1
+                else:
+                    s.idle += 1
+
+            if blocked:
+                self._stall += 1
+                stats.stalled(self._stall)
+                if in_period:
+                    period_stats.stalled(self._stall)
+            elif self._stall:
+                stats.stall_ended(self._stall)
+                if in_period:
+                    period_stats.stall_ended(self._stall)
+                self._stall = 0
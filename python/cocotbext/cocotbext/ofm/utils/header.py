@@ -2,7 +2,7 @@ def concat(values):
     ret = 0
     for val, width in reversed(values):
         ret <<= width
-        ret |= val & (2**width - 1)
+        ret |= val & ((1 << width) - 1)
     return ret
 
 
@@ -10,33 +10,78 @@ def deconcat(values=[0, 0]):
     vector = values[0]
     ret = []
     for width in values[1:]:
-        ret.append(vector & (2**width - 1))
+        ret.append(vector & ((1 << width) - 1))
         vector >>= width
     return ret
 
 
-class SerializableHeader(object):
+class _SerializableHeaderMeta(type):
+    """Creates __slots__ of the header class from the names of its items."""
+
+    def __new__(mcs, name, bases, namespace):
+        if "__slots__" not in namespace:
+            inherited = {slot for base in bases for c in base.__mro__ for slot in getattr(c, "__slots__", ())}
+            names = dict.fromkeys(item[0] for item in namespace.get("items", []))
+            namespace["__slots__"] = tuple(n for n in names if n not in inherited)
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class SerializableHeader(metaclass=_SerializableHeaderMeta):
+    """Header with items (list of (name, width) tuples) serialized into an integer, the first item at the LSB.
+
+    The codec is compiled once for each subclass: the shifts and masks of the items are precomputed
+    in __init_subclass__ and the values of the items are stored in __slots__.
+    """
+
     items = []
+    _names = ()
+    _fields = ()
+    _width = 0
+    _byte_count = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        fields = []
+        shift = 0
+        for name, width in cls.items:
+            fields.append((name, shift, (1 << width) - 1))
+            shift += width
+
+        cls._names = tuple(dict.fromkeys(name for name, _ in cls.items))
+        cls._fields = tuple(fields)
+        cls._width = shift
+        cls._byte_count = (shift + 7) // 8
 
     def __init__(self):
-        for i in self.items:
-            setattr(self, i[0], 0)
+        for name in self._names:
+            setattr(self, name, 0)
 
     def __str__(self):
         return f"{[(item[0], getattr(self, item[0])) for item in self.items]}"
 
     def serialize(self):
-        names, widths = list(zip(*self.items)) if self.items else ([], [])
-        return concat(list(zip([getattr(self, name) for name in names], widths)))
+        ret = 0
+        for name, shift, mask in self._fields:
+            ret |= (getattr(self, name) & mask) << shift
+        return ret
+
+    def to_bytes(self, byteorder="little"):
+        """Returns the serialized header as bytes."""
+        return self.serialize().to_bytes(self._byte_count, byteorder=byteorder)
 
     @classmethod
     def __len__(cls):
-        return sum([x[1] for x in cls.items])
+        return cls._width
 
     @classmethod
     def deserialize(cls, val: int):
-        ret = cls()
-        for i in cls.items:
-            setattr(ret, i[0], val & 2 ** i[1] - 1)
-            val >>= i[1]
+        ret = cls.__new__(cls)
+        for name, shift, mask in cls._fields:
+            setattr(ret, name, (val >> shift) & mask)
         return ret
+
+    @classmethod
+    def from_bytes(cls, data, byteorder="little"):
+        """Returns header deserialized from bytes (bytes, bytearray or memoryview)."""
+        return cls.deserialize(int.from_bytes(data, byteorder=byteorder))
@@ -0,0 +1,74 @@
+# histogram.py: Histogram of measured values
+# Copyright (C) 2024 CESNET z. s. p. o.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from collections import Counter
+
+
+class Histogram:
+    """Histogram of measured values (latencies, stall lengths, ...) with fixed bin width.
+
+    Atributes:
+        bin_width: width of one bin. Values are stored as bin indexes (value // bin_width), so with
+                   the default width of 1 and integer values (e.g. clock cycles) the statistics are exact.
+        bins(Counter): number of values in each bin, indexed by bin index.
+        count(int): number of added values.
+        total: sum of added values.
+        min, max: minimal and maximal added value, None if no value was added.
+    """
+
+    def __init__(self, bin_width=1) -> None:
+        self.bin_width = bin_width
+        self.clear()
+
+    def clear(self) -> None:
+        """Removes all values."""
+        self.bins = Counter()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value, count: int = 1) -> None:
+        """Adds value to the histogram count times."""
+        self.bins[int(value // self.bin_width)] += count
+        self.count += count
+        self.total += value * count
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def mean(self) -> float:
+        """Returns average of added values, 0 if no value was added."""
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, p: float):
+        """Returns the p-th percentile (0 <= p <= 100) as the lower edge of the bin containing it."""
+        if not self.count:
+            return 0
+
+        rank = p / 100 * self.count
+        cumulative = 0
+        for index in sorted(self.bins):
+            cumulative += self.bins[index]
+            if cumulative >= rank:
+                return index * self.bin_width
+        return self.max
+
+    def items(self) -> list:
+        """Returns list of (lower edge of the bin, count) tuples sorted by value."""
+        return [(index * self.bin_width, self.bins[index]) for index in sorted(self.bins)]
+
+    def summary(self, fmt: str = "{}", scale=1) -> str:
+        """Returns one line summary: count, min, avg, p99 and max. Values are multiplied by scale and formatted by fmt."""
+        if not self.count:
+            return "count: 0"
+
+        return ", ".join([f"count: {self.count}"] + [
+            f"{name}: {fmt.format(value * scale)}" for name, value in [
+                ("min", self.min), ("avg", self.mean()), ("p99", self.percentile(99)), ("max", self.max),
+            ]
+        ])
@@ -0,0 +1,132 @@
+# latency_probe.py: Probe for measuring latency of transactions between an input and an output
+# Copyright (C) 2024 CESNET z. s. p. o.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from collections import deque
+
+from cocotb.utils import get_sim_time
+from cocotbext.ofm.base.probe import Probe, ProbeInterface
+from cocotbext.ofm.utils.histogram import Histogram
+
+
+class LatencyProbeInterface(ProbeInterface):
+    """Latency probe interface, works with any monitor which has the clock attribute (usually the output monitor)."""
+    interface_dict = {
+        "clock"   : "clock",
+        "in_reset": "in_reset",
+    }
+
+
+class LatencyProbe(Probe):
+    """
+    Probe for measuring latency of transactions in clock cycles.
+
+    Transactions seen on the input (monitor, or driver with the append(transaction, callback) method) are timestamped
+    and matched with the transactions of the output monitor, by order or by the key function.
+
+    Atributes:
+        histogram(Histogram): latencies of all matched transactions in clock cycles.
+        period_histogram(Histogram): latencies of the transactions matched in the current log period.
+        unmatched(int): number of output transactions without matching input transaction.
+        _key: function returning key of the transaction, None for matching by order.
+        _pending: timestamps (in simulator steps) of the input transactions waiting for the output, deque for
+                  the order matching, dict of deques indexed by key for the key matching (emptied keys are removed).
+        _clk_period(int): clock period in simulator steps.
+
+    Usage:
+        - Create the probe with the input agent and the output monitor:
+          probe = LatencyProbe(tb.stream_in, tb.stream_out, key=lambda tr: bytes(tr[:8]))
+
+        - Optionally set the log intervals and period like with the ThroughputProbe (add_log_interval, set_log_period).
+          Statistics of the latencies in each period are logged at the period ticks.
+
+        - Call log_latency at the end of the test for the statistics of all transactions.
+    """
+    def __init__(self, input, output, key=None, period: int = 0, time_units: str = "us", log_intervals: list = [], callback=None):
+        self._clk_period = None
+        self._early = []
+        self._key = key
+        self._pending = deque() if key is None else {}
+        self.histogram = Histogram()
+        self.period_histogram = Histogram()
+        self.unmatched = 0
+
+        super().__init__(LatencyProbeInterface(output), period, time_units, log_intervals, callback)
+
+        self._attach_input(input)
+        output.add_callback(self._output_transaction)
+
+    def _attach_input(self, agent) -> None:
+        """Timestamps transactions of a monitor via its callback, transactions of a driver via the callback of append."""
+        if hasattr(agent, "add_callback"):
+            agent.add_callback(self._input_transaction)
+            return
+
+        append = agent.append
+
+        def append_timestamped(transaction, callback=None, event=None, **kwargs):
+            def sent(transaction):
+                self._input_transaction(transaction)
+                if callback:
+                    callback(transaction)
+            append(transaction, callback=sent, event=event, **kwargs)
+
+        agent.append = append_timestamped
+
+    def _input_transaction(self, transaction) -> None:
+        if self._key is None:
+            self._pending.append(get_sim_time("step"))
+        else:
+            self._pending.setdefault(self._key(transaction), deque()).append(get_sim_time("step"))
+
+    def _output_transaction(self, transaction) -> None:
+        key = None if self._key is None else self._key(transaction)
+        queue = self._pending if self._key is None else self._pending.get(key)
+        if not queue:
+            self.unmatched += 1
+            return
+
+        latency = get_sim_time("step") - queue.popleft()
+        if self._key is not None and not queue:
+            del self._pending[key]
+        if self._clk_period is None:
+            self._early.append(latency)
+        else:
+            self._add_latency(latency)
+
+    def _add_latency(self, latency: int) -> None:
+        cycles = round(latency / self._clk_period)
+        self.histogram.add(cycles)
+        if self._active is not None:
+            self.period_histogram.add(cycles)
+
+    def pending(self) -> int:
+        """Returns number of input transactions waiting for the output."""
+        if self._key is None:
+            return len(self._pending)
+        return sum(len(q) for q in self._pending.values())
+
+    def log_latency(self) -> None:
+        """Prints out statistics of the latency of all matched transactions."""
+        self.log.info(f"Latency [cycles]: {self.histogram.summary('{:.1f}')}, unmatched: {self.unmatched}, pending: {self.pending()}")
+
+    def _interval_started(self) -> None:
+        self.period_histogram.clear()
+
+    def _period_elapsed(self) -> None:
+        self.log.info(f"Latency at {get_sim_time(units=self._format_units_for_get_sim_time(self._time_units))} {self._time_units} [cycles]: {self.period_histogram.summary('{:.1f}')}")
+        self.period_histogram.clear()
+
+    async def _start_probe(self) -> None:
+        """Measures the clock period and runs the log intervals scheduler."""
+        await self._clk_re
+        start = get_sim_time("step")
+        await self._clk_re
+        self._clk_period = get_sim_time("step") - start
+
+        for latency in self._early:
+            self._add_latency(latency)
+        self._early.clear()
+
+        await self._run_schedule()
@@ -1,15 +1,164 @@
-class RAM:
-    def __init__(self, capacity):
-        self._mem = bytearray(capacity)
+import mmap
+
+
+class RAMBase:
+    _write_callbacks = ()
 
     def wint(self, addr, integer, byte_count, byteorder="little"):
-        self.w(addr, list(integer.to_bytes(byte_count, byteorder=byteorder)))
+        self.w(addr, integer.to_bytes(byte_count, byteorder=byteorder))
 
     def rint(self, addr, byte_count, byteorder="little"):
         return int.from_bytes(self.r(addr, byte_count), byteorder=byteorder)
 
+    def add_write_callback(self, addr, byte_count, callback):
+        """Calls callback() after each write by w()/wint() which overlaps the range."""
+        self._write_callbacks = self._write_callbacks + ((addr, addr + byte_count, callback),)
+
+    def remove_write_callback(self, callback):
+        self._write_callbacks = tuple(c for c in self._write_callbacks if c[2] != callback)
+
+    def _written(self, addr, byte_count):
+        for start, end, callback in self._write_callbacks:
+            if addr < end and start < addr + byte_count:
+                callback()
+
+
+class RAM(RAMBase):
+    def __init__(self, capacity):
+        self._mem = bytearray(capacity)
+
     def w(self, addr, byte):
         self._mem[addr: addr + len(byte)] = byte
+        if self._write_callbacks:
+            self._written(addr, len(byte))
 
     def r(self, addr, byte_count):
         return self._mem[addr: addr + byte_count]
+
+    def view(self, addr, byte_count):
+        """Returns writable memoryview of the memory, which stays valid for the whole RAM lifetime."""
+        return memoryview(self._mem)[addr: addr + byte_count]
+
+
+class SparseRAM(RAMBase):
+    """RAM with the memory allocated by pages on the first access.
+
+    Unallocated pages read as zeros. Accesses within one page are done without copying:
+    r() allocates the page and returns memoryview of it, so the returned data always changes
+    with later writes. Accesses crossing the page boundary return a copy (bytearray) instead,
+    use bytes(ram.r(...)) when the data are needed as they were at the time of the read.
+
+    Args:
+        capacity: size of the memory in bytes.
+        page_size: size of one page in bytes.
+        path: optional path to a file which backs the memory (mmap'd, created or resized
+              to the capacity). The content can be inspected or shared with an external process;
+              the sparseness is then left to the operating system.
+
+    Atributes:
+        dirty(set): indexes of the pages written by w() and wint() since the last clear_dirty().
+                    Writes through view() are not tracked.
+    """
+
+    def __init__(self, capacity, page_size=0x10000, path=None):
+        assert page_size & (page_size - 1) == 0, "page_size must be a power of two"
+
+        self.capacity = capacity
+        self.page_size = page_size
+        self.dirty = set()
+
+        self._pages = {}
+        self._page_shift = page_size.bit_length() - 1
+        self._page_mask = page_size - 1
+
+        self._file = None
+        self._mmap = None
+        if path is not None:
+            self._file = open(path, "a+b")
+            self._file.truncate(capacity)
+            self._mmap = mmap.mmap(self._file.fileno(), capacity)
+
+    def close(self):
+        """Flushes and closes the backing file. Views returned by r() and view() must be released before."""
+        if self._mmap is not None:
+            for page in self._pages.values():
+                page.release()
+            self._pages.clear()
+            self._mmap.flush()
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+    def pages(self):
+        """Returns number of allocated pages."""
+        return len(self._pages)
+
+    def dirty_ranges(self):
+        """Returns sorted list of (addr, byte_count) ranges of the dirty pages, adjacent pages are merged."""
+        ranges = []
+        for index in sorted(self.dirty):
+            addr = index << self._page_shift
+            if ranges and ranges[-1][0] + ranges[-1][1] == addr:
+                ranges[-1] = (ranges[-1][0], ranges[-1][1] + self.page_size)
+            else:
+                ranges.append((addr, self.page_size))
+        return ranges
+
+    def clear_dirty(self):
+        self.dirty.clear()
+
+    def _page(self, index):
+        page = self._pages.get(index)
+        if page is None:
+            if self._mmap is not None:
+                addr = index << self._page_shift
+                page = memoryview(self._mmap)[addr: addr + self.page_size]
+            else:
+                page = memoryview(bytearray(self.page_size))
+            self._pages[index] = page
+        return page
+
+    def _read_page(self, index):
+        """Returns the page or None when it wasn't allocated (pages of the backing file always exist)."""
+        return self._page(index) if self._mmap is not None else self._pages.get(index)
+
+    def _chunks(self, addr, byte_count):
+        """Yields (page index, offset in page, offset in data, byte count) for each page touched by the access."""
+        assert 0 <= addr and addr + byte_count <= self.capacity, "access out of range"
+        pos = 0
+        while pos < byte_count:
+            offset = (addr + pos) & self._page_mask
+            cnt = min(byte_count - pos, self.page_size - offset)
+            yield (addr + pos) >> self._page_shift, offset, pos, cnt
+            pos += cnt
+
+    def w(self, addr, byte):
+        byte = memoryview(byte) if isinstance(byte, (bytes, bytearray, memoryview)) else memoryview(bytes(byte))
+        for index, offset, pos, cnt in self._chunks(addr, len(byte)):
+            self._page(index)[offset: offset + cnt] = byte[pos: pos + cnt]
+            self.dirty.add(index)
+        if self._write_callbacks:
+            self._written(addr, len(byte))
+
+    def r(self, addr, byte_count):
+        offset = addr & self._page_mask
+        if offset + byte_count <= self.page_size:
+            assert 0 <= addr and addr + byte_count <= self.capacity, "access out of range"
+            return self._page(addr >> self._page_shift)[offset: offset + byte_count]
+
+        ret = bytearray(byte_count)
+        for index, offset, pos, cnt in self._chunks(addr, byte_count):
+            page = self._read_page(index)
+            if page is not None:
+                ret[pos: pos + cnt] = page[offset: offset + cnt]
+        return ret
+
+    def view(self, addr, byte_count):
+        """Returns writable memoryview of the memory, which stays valid for the whole RAM lifetime.
+
+        The range must not cross the page boundary.
+        """
+        offset = addr & self._page_mask
+        if offset + byte_count > self.page_size:
+            raise ValueError(f"view of {byte_count} bytes at {addr:#x} crosses the page boundary")
+        return self._page(addr >> self._page_shift)[offset: offset + byte_count]
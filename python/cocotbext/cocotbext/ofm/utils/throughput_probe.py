@@ -4,9 +4,12 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import cocotb
+from cocotb.triggers import Edge
 from cocotbext.ofm.base.probe import Probe, ProbeInterface
-from cocotb.utils import get_sim_time
+from cocotb.utils import get_sim_time, get_time_from_sim_steps
 from cocotbext.ofm.utils.units import convert_units
+from cocotbext.ofm.utils.throughput_series import ThroughputSeries
 from cocotbext.ofm.mvb.monitors import MVBMonitor
 from cocotbext.ofm.mfb.monitors import MFBMonitor
 
@@ -61,16 +64,24 @@ class ThroughputProbe(Probe):
     """
     Probe for measuring and logging throughput and efficiency.
 
+    The probe doesn't wake up each clock cycle: the total number of items is computed from the elapsed time
+    and the clock period (measured at the start), only the cycles in reset are counted one by one.
+    The immediate throughput is evaluated at the period ticks of the log intervals scheduler.
+
     Atributes:
         _total_item_cnt(int): total number of items that could've passed through the bus during the simulation.
-        _log_vals_cleared(bool): if the values of variables necessary for calculating immediate throughput are
-                                 valid or cleared.
-        _start_of_period(int): time in the simulation when the measured period started (used for measuring immediate
+        _clk_start(int): time of the first clock rising edge seen by the probe in simulator steps.
+        _clk_period(int): clock period in simulator steps.
+        _reset_cycles(int): number of clock cycles in reset since _clk_start.
+        _start_of_period(int): time in the simulation in steps when the measured period started (used for measuring immediate
                                throughput and efficiency).
         _total_item_cnt_at_start_of_period(int): number of total items at the start of the measured period
                                                  (used for measuring immediate throughput and efficiency).
         _vld_item_cnt_at_start_of_period(int): number of valid items at the start of the measured period
                                                (used for measuring immediate throughput and efficiency).
+        series(ThroughputSeries): samples of all measured periods, in the throughput units of the probe.
+        log_immediate(bool): log the immediate throughput at the end of each period. When False,
+                             the periods are only recorded in the series.
 
     Usage:
         - A custom interface for the probed bus is necessary for the probe to function. Use one intended for the probed
@@ -96,16 +107,49 @@ class ThroughputProbe(Probe):
 
         - To get the average throughput and efficiency, call the log_average_throughput class.
           This is usually done at the end of the test.
+
+        - Throughput of each period is recorded in the series attribute. Use log_throughput_statistics for its
+          percentiles and the worst sliding window, or export it (series.to_csv, to_json, to_numpy, plot).
     """
-    def __init__(self, interface: ThroughputProbeInterface = None, period: int = 0, throughput_units: str = "items", time_units: str = "us", log_intervals: list = [], callback=None):
+    def __init__(self, interface: ThroughputProbeInterface = None, period: int = 0, throughput_units: str = "items", time_units: str = "us", log_intervals: list = [], callback=None, log_immediate: bool = True):
+        self._clk_start = None
+        self._clk_period = None
+        self._reset_cycles = 0
         super().__init__(interface, period, time_units, log_intervals, callback)
-        self._total_item_cnt = 0
         self._clear_log_values()
         self._throughput_units = throughput_units.lower()
 
         if self._throughput_units not in ["items", "bits", "bytes"]:
             raise ValueError(f"Unknown throughput units '{self._throughput_units}'. Possible units are: 'items', 'bits', 'bytes'.")
 
+        self.log_immediate = log_immediate
+        scale, units = {"items": (1, "Items"), "bits": (self._interface.item_width, "b"), "bytes": (self._interface.item_width / 8, "B")}[self._throughput_units]
+        self.series = ThroughputSeries(scale, units)
+
+    def log_throughput_statistics(self, window: int = 10, throughput_units: str = None) -> None:
+        """
+        Prints out percentiles of the throughput of the recorded periods and the worst sliding window.
+
+        Args:
+            window: number of consecutive periods averaged in the sliding window.
+            throughput_units: how big unit should throughput use, optimal units: 'k'(ilo), 'M'(ega), 'G'(iga), 'T'(era).
+                              If None, units are chosen automatically based on the calculated throughput.
+        """
+        if not len(self.series):
+            self.log.info("No throughput periods recorded")
+            return
+
+        values = [("p1", self.series.percentile(1)), ("p50", self.series.percentile(50)), ("p99", self.series.percentile(99))]
+        windows = self.series.sliding_window(window)
+        if windows:
+            values.append((f"min of {window} periods average", min(windows)))
+
+        stats = []
+        for name, value in values:
+            value, units = convert_units(value, "", throughput_units)
+            stats.append(f"{name}: {round(value, 4):,} {units}{self.series.units}/s")
+        self.log.info(f"Throughput of {len(self.series)} periods: " + ", ".join(stats))
+
     def log_average_throughput(self, throughput_units: str = None) -> None:
         """Prints out average throughput and efficiency."""
         throughput, throughput_units = self._convert_throughput_units(self._get_average_throughput(), throughput_units)
@@ -122,13 +166,25 @@ class ThroughputProbe(Probe):
         throughput, throughput_units = self._convert_throughput_units(self._get_max_throughput(), throughput_units)
         self.log.info(f"Aproximate maximum possible throughput: {round(throughput, 4):,} {throughput_units}/s")
 
+    @property
+    def _total_item_cnt(self) -> int:
+        if self._clk_period is None:
+            return 0
+
+        cycles = (get_sim_time("step") - self._clk_start) // self._clk_period + 1
+        return (cycles - self._reset_cycles) * self._interface.items
+
     def _clear_log_values(self) -> None:
         """Clears critical values used for logging."""
-        self._log_vals_cleared = True
         self._start_of_period = 0
         self._total_item_cnt_at_start_of_period = 0
         self._vld_item_cnt_at_start_of_period = 0
 
+    def _set_start_of_period(self) -> None:
+        self._start_of_period = get_sim_time("step")
+        self._total_item_cnt_at_start_of_period = self._total_item_cnt
+        self._vld_item_cnt_at_start_of_period = self._interface.item_cnt
+
     def _convert_throughput_units(self, value: int, throughput_mult_units: str) -> (float, str):
         """
         Converts base throughput units (Items/s) into ideal or specified multiples. Keeps them in items or converts
@@ -150,51 +206,35 @@ class ThroughputProbe(Probe):
 
         return throughput, throughput_units
 
-    def _log_immediate_throughput(self, period: int, time_units: str = "us", throughput_units: str = None) -> None:
+    def _log_immediate_throughput(self, time_units: str = None, throughput_units: str = None) -> None:
         """
-        Logs throughput of the bus in a section of specified length (period).
+        Logs throughput of the bus since the start of the period and starts a new period.
 
         Args:
-            period: length of the sections during which the throughput is measured.
-            time_units: unit of the period.
+            time_units: units of the time in the log, time units of the probe by default.
             throughput_units: how big unit should throughput use, optimal units: 'k'(ilo), 'M'(ega), 'G'(iga), 'T'(era).
                               If None, units are chosen automatically based on the calculated throughput.
         """
-        gst_time_units = self._format_units_for_get_sim_time(time_units)
+        time_units = time_units or self._time_units
+        period = get_sim_time("step") - self._start_of_period
 
-        if len(self._log_intervals) == 0:
-            self._clear_log_values()
+        if period == 0:
             return
 
-        if self._simtime_is_in_log_interval():
-            if self._log_vals_cleared:
-                self._log_vals_cleared = False
+        throughput_base_units = (self._interface.item_cnt-self._vld_item_cnt_at_start_of_period) / get_time_from_sim_steps(period, "sec")
+        throughput, throughput_units = self._convert_throughput_units(throughput_base_units, throughput_units)
 
-                start_time, stop_time, units, _ = self._log_intervals[0]
-                self._start_of_period = convert_units(start_time, units.strip("s"), time_units.strip("s"))[0]
-                self._total_item_cnt_at_start_of_period = self._total_item_cnt
-                self._vld_item_cnt_at_start_of_period = self._interface.item_cnt
+        efficiency = self._get_immediate_efficiency()*100
 
-            else:
-                if period == 0:
-                    return
+        self.series.append(
+            get_time_from_sim_steps(self._start_of_period, "sec"), get_sim_time("sec"),
+            self._interface.item_cnt - self._vld_item_cnt_at_start_of_period, self._total_item_cnt - self._total_item_cnt_at_start_of_period,
+        )
 
-                time_diff = round(get_sim_time(units=gst_time_units) - self._start_of_period, 4)
+        if self.log_immediate:
+            self.log.info(f"Immediate throughput at {get_sim_time(units=self._format_units_for_get_sim_time(time_units))} {time_units}: {round(throughput, 4):,} {throughput_units}/s, Immediate efficiency: {round(efficiency, 4)}%")
 
-                if time_diff >= period:
-                    throughput_base_units = (self._interface.item_cnt-self._vld_item_cnt_at_start_of_period) / convert_units(period, time_units.strip("s"), "")[0]
-                    throughput, throughput_units = self._convert_throughput_units(throughput_base_units, throughput_units)
-
-                    efficiency = self._get_immediate_efficiency()*100
-
-                    self.log.info(f"Immediate throughput at {get_sim_time(units=gst_time_units)} {time_units}: {round(throughput, 4):,} {throughput_units}/s, Immediate efficiency: {round(efficiency, 4)}%")
-
-                    self._start_of_period = get_sim_time(units=gst_time_units)
-                    self._total_item_cnt_at_start_of_period = self._total_item_cnt
-                    self._vld_item_cnt_at_start_of_period = self._interface.item_cnt
-
-        else:
-            self._clear_log_values()
+        self._set_start_of_period()
 
     def _get_immediate_efficiency(self) -> float:
         """
@@ -241,17 +281,38 @@ class ThroughputProbe(Probe):
         """
         return self._interface.item_cnt/self._total_item_cnt
 
-    async def _start_probe(self) -> None:
-        """
-        The main function incrementing the number of possible items and running the function for immediate logging
-        each clock cycle.
-        """
-        while True:
-            await self._clk_re
+    def _interval_started(self) -> None:
+        self._set_start_of_period()
 
-            if self._interface.in_reset:
-                continue
+    def _period_elapsed(self) -> None:
+        self._log_immediate_throughput()
 
-            self._total_item_cnt += self._interface.items
+    def _interval_stopped(self) -> None:
+        self._clear_log_values()
+
+    async def _count_reset_cycles(self) -> None:
+        """Counts clock cycles in reset. Wakes up each clock only during the reset, otherwise waits for the reset signal change."""
+        monitor = self._interface._monitor
+        reset = getattr(monitor, "_reset", None) or getattr(monitor, "_reset_n", None)
+
+        while True:
+            while self._interface.in_reset:
+                self._reset_cycles += 1
+                await self._clk_re
 
-            self._log_immediate_throughput(round(self._get_log_period(), 4), self._time_units)
+            if reset is None:
+                return
+            await Edge(reset)
+
+    async def _start_probe(self) -> None:
+        """
+        The main function measuring the clock period and running the log intervals scheduler.
+        """
+        await self._clk_re
+        start = get_sim_time("step")
+        await self._clk_re
+        self._clk_period = get_sim_time("step") - start
+        self._clk_start = start
+
+        cocotb.start_soon(self._count_reset_cycles())
+        await self._run_schedule()
@@ -0,0 +1,117 @@
+# throughput_series.py: Time series of throughput samples
+# Copyright (C) 2024 CESNET z. s. p. o.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import csv
+import json
+from array import array
+
+
+class ThroughputSeries:
+    """
+    Compact time series of throughput samples, one sample per measured period.
+
+    Atributes:
+        start(array): start time of each sample in seconds.
+        end(array): end time of each sample in seconds.
+        valid(array): number of valid items which passed during each sample.
+        total(array): number of items which could have passed during each sample.
+        scale(float): multiplier converting items to the reported units (e.g. item width for bits).
+        units(str): name of the reported units ("Items", "b" or "B").
+    """
+
+    fields = ["start", "end", "valid", "total", "throughput", "efficiency"]
+
+    def __init__(self, scale: float = 1, units: str = "Items") -> None:
+        self.scale = scale
+        self.units = units
+        self.clear()
+
+    def clear(self) -> None:
+        self.start = array("d")
+        self.end = array("d")
+        self.valid = array("Q")
+        self.total = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.end)
+
+    def append(self, start: float, end: float, valid: int, total: int) -> None:
+        self.start.append(start)
+        self.end.append(end)
+        self.valid.append(valid)
+        self.total.append(total)
+
+    def throughput(self) -> list:
+        """Returns throughput of each sample in units per second."""
+        return [v * self.scale / (e - s) for s, e, v in zip(self.start, self.end, self.valid)]
+
+    def efficiency(self) -> list:
+        """Returns efficiency of each sample as a decimal number (0 <= n <= 1)."""
+        return [v / t if t else 0.0 for v, t in zip(self.valid, self.total)]
+
+    def percentile(self, p: float) -> float:
+        """Returns the p-th percentile (0 <= p <= 100) of the sample throughputs (nearest rank)."""
+        values = sorted(self.throughput())
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, max(0, int(-(-p * len(values) // 100)) - 1))]
+
+    def sliding_window(self, window: int) -> list:
+        """Returns throughput averaged over each window of consecutive samples, in units per second."""
+        ret = []
+        valid = 0
+        for i in range(len(self)):
+            valid += self.valid[i]
+            if i >= window:
+                valid -= self.valid[i - window]
+            if i >= window - 1:
+                ret.append(valid * self.scale / (self.end[i] - self.start[i - window + 1]))
+        return ret
+
+    def rows(self):
+        """Yields one tuple with the values of the fields for each sample."""
+        yield from zip(self.start, self.end, self.valid, self.total, self.throughput(), self.efficiency())
+
+    def to_csv(self, file_name: str) -> None:
+        with open(file_name, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.fields[:4] + [f"throughput [{self.units}/s]", "efficiency"])
+            writer.writerows(self.rows())
+
+    def to_json(self, file_name: str) -> None:
+        with open(file_name, "w") as f:
+            json.dump({"units": self.units, "samples": [dict(zip(self.fields, row)) for row in self.rows()]}, f)
+
+    def to_numpy(self):
+        """Returns NumPy structured array with the fields of the samples."""
+        import numpy as np
+
+        return np.array(list(self.rows()), dtype=[(f, "f8") for f in self.fields])
+
+    def plot(self, folder: str = None, file_name: str = "throughput", title: str = None, window: int = 0, gen=None) -> None:
+        """
+        Plots the throughput over time with the GraphGen of the data_logger tools (logger_tools package).
+
+        GraphGen deletes all graphs in its folder when it is created. To plot more series into one folder,
+        create the GraphGen once and pass it to each call with a different file_name.
+
+        Args:
+            folder: output folder of the graphs (path with trailing slash), used when gen is not passed.
+            window: if nonzero, the sliding window average over that many samples is plotted too.
+            gen: GraphGen instance to plot with, it is reused instead of creating a new one in the folder.
+        """
+        if gen is None:
+            from graph_gen.graph_gen import GraphGen
+
+            gen = GraphGen(folder)
+
+        gen.init_plots(title=title)
+        gen.basic_plot(list(self.end), [self.throughput()], style="-")
+        if window and len(self) >= window:
+            gen.basic_plot(list(self.end[window - 1:]), [self.sliding_window(window)], style="-")
+            gen.legend(["period", f"{window} periods average"])
+        gen.set_xlabel("Time [s]")
+        gen.set_ylabel(f"Throughput [{self.units}/s]")
+        gen.plot_save(file_name)
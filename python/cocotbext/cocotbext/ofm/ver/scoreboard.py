@@ -0,0 +1,269 @@
+# scoreboard.py: Streaming scoreboard with bounded memory
+# Copyright (C) 2024 CESNET z. s. p. o.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import logging
+from collections import deque
+
+from cocotb.triggers import Event
+from cocotb.utils import get_sim_time
+from cocotb_bus._compat import test_success
+
+from cocotbext.ofm.utils.histogram import Histogram
+
+
+def _format(transaction) -> str:
+    if isinstance(transaction, (bytes, bytearray, memoryview)):
+        return bytes(transaction).hex()
+    return repr(transaction)
+
+
+class ScoreboardInterface:
+    """
+    Expected transactions of one monitor and statistics of the matched ones.
+
+    Without the key function, the received transactions are matched in order. With the key function,
+    the expected transactions are indexed by their key and each received transaction is matched with
+    the oldest expected transaction of the same key (out of order between different keys).
+
+    Atributes:
+        name(str): name of the interface used in the reports.
+        matched(int): number of received transactions equal to the expected ones.
+        errors(int): number of mismatched, missing and unexpected transactions.
+        latency(Histogram): time from the expectation to the reception of the matched transactions.
+        _window(int): maximal distance (in number of expected transactions) between the oldest outstanding and
+                      the newest expected transaction, 0 for unlimited. It bounds both the number of outstanding
+                      transactions and the reordering, older transactions are reported missing.
+        _index: outstanding expected transactions as (sequence number, transaction, time, key),
+                deque for the in order matching, dict of deques indexed by key otherwise.
+        _order(deque): (sequence number, key) of the expected transactions in order of expectation,
+                       matched entries are removed lazily (key matching only).
+    """
+
+    def __init__(self, scoreboard, name, key=None, window=0, compare=None):
+        self.name = name
+        self._scoreboard = scoreboard
+        self._key = key
+        self._window = window
+        self._compare = compare
+        self._index = deque() if key is None else {}
+        self._order = deque()
+        self._outstanding = 0
+        self._seq = 0
+        self._space = Event()
+
+        self.matched = 0
+        self.matched_bytes = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self._first_time = None
+        self._last_time = None
+
+    def __len__(self) -> int:
+        """Returns number of outstanding expected transactions."""
+        return self._outstanding
+
+    def append(self, transaction) -> None:
+        """Adds expected transaction. Outstanding transactions which fall out of the window are reported missing."""
+        key = None if self._key is None else self._key(transaction)
+        entry = (self._seq, transaction, get_sim_time(self._scoreboard.time_units), key)
+        self._seq += 1
+        self._outstanding += 1
+
+        if self._key is None:
+            self._index.append(entry)
+        else:
+            self._index.setdefault(key, deque()).append(entry)
+            self._order.append((entry[0], key))
+
+        if self._window:
+            while self._oldest_seq() <= self._seq - 1 - self._window:
+                self._evict()
+
+    async def put(self, transaction) -> None:
+        """Adds expected transaction, waits until the number of outstanding transactions is below the window."""
+        while self._window and self._outstanding >= self._window:
+            self._space.clear()
+            await self._space.wait()
+        self.append(transaction)
+
+    def _prune(self) -> None:
+        """Removes already matched entries from the start of the order queue."""
+        order, index = self._order, self._index
+        while order:
+            seq, key = order[0]
+            queue = index.get(key)
+            if queue and queue[0][0] == seq:
+                return
+            order.popleft()
+
+    def _remove(self, queue) -> tuple:
+        entry = queue.popleft()
+        if self._key is not None and not queue:
+            del self._index[entry[3]]
+        self._outstanding -= 1
+        self._space.set()
+        return entry
+
+    def _oldest_seq(self) -> int:
+        if self._key is None:
+            return self._index[0][0]
+        self._prune()
+        return self._order[0][0]
+
+    def _evict(self) -> None:
+        if self._key is None:
+            queue = self._index
+        else:
+            queue = self._index[self._order[0][1]]
+
+        entry = self._remove(queue)
+        self._error("missing", expected=entry[1])
+
+    def received(self, transaction) -> None:
+        """Matches the transaction received by the monitor."""
+        if self._key is None:
+            key, queue = None, self._index
+        else:
+            key = self._key(transaction)
+            queue = self._index.get(key)
+
+        if not queue:
+            self._error("unexpected", received=transaction)
+            return
+
+        _, expected, time, _ = self._remove(queue)
+        if self._key is not None:
+            self._prune()
+
+        equal = self._compare(transaction, expected) if self._compare else transaction == expected
+        if not equal:
+            self._error("mismatch", expected=expected, received=transaction)
+            return
+
+        now = get_sim_time(self._scoreboard.time_units)
+        self.matched += 1
+        if isinstance(transaction, (bytes, bytearray, memoryview)):
+            self.matched_bytes += len(transaction)
+        self.latency.add(now - time)
+        if self._first_time is None:
+            self._first_time = now
+        self._last_time = now
+
+    def received_batch(self, transactions) -> None:
+        for transaction in transactions:
+            self.received(transaction)
+
+    def _error(self, kind, expected=None, received=None) -> None:
+        self.errors += 1
+        self._scoreboard._error(self, kind, expected, received)
+
+    def throughput(self) -> float:
+        """Returns matched transactions per time unit between the first and the last match."""
+        if not self._last_time or self._last_time == self._first_time:
+            return 0.0
+        return (self.matched - 1) / (self._last_time - self._first_time)
+
+    def summary(self) -> str:
+        units = self._scoreboard.time_units
+        return (
+            f"{self.name}: matched {self.matched} ({self.matched_bytes} B), errors {self.errors}, "
+            f"outstanding {self._outstanding}, throughput {self.throughput():.4f} per {units}, "
+            f"latency [{units}]: {self.latency.summary('{:.1f}')}"
+        )
+
+
+class StreamScoreboard:
+    """
+    Scoreboard for long runs: memory is bounded by the window of outstanding expected transactions,
+    matched transactions are dropped immediately and errors are streamed into a file.
+
+    The interface is similar to the cocotb_bus Scoreboard: add_interface returns object with the append
+    method, which can be used instead of the list of the expected output, and result is raised at the end
+    of the test.
+
+    Args:
+        dut: handle to the DUT, used for the name of the logger.
+        mismatch_file: name of the file, into which errors are written as JSON lines
+                       (time, interface, kind, expected, received). Kinds are "mismatch" (different
+                       transaction received), "missing" (expected transaction fell out of the window)
+                       and "unexpected" (nothing expected).
+        fail_immediately: raises AssertionError on the first error.
+        max_logged: number of errors which are logged, the others are only written into the file.
+        time_units: units of the latency and throughput.
+    """
+
+    def __init__(self, dut, mismatch_file=None, fail_immediately=True, max_logged=10, time_units="ns"):
+        self.log = logging.getLogger(f"cocotb.scoreboard.{dut._name}")
+        self.time_units = time_units
+        self.interfaces = []
+        self.errors = 0
+        self._imm = fail_immediately
+        self._max_logged = max_logged
+        self._file = open(mismatch_file, "w") if mismatch_file else None
+
+    def add_interface(self, monitor, key=None, window=0, compare=None, batch=False) -> ScoreboardInterface:
+        """
+        Adds monitor to be scoreboarded.
+
+        Args:
+            monitor: the monitor object.
+            key: function returning the key of the transaction for the out of order matching, None for in order.
+            window: maximal distance between the oldest outstanding and the newest expected transaction,
+                    0 for unlimited (see ScoreboardInterface).
+            compare: function comparing received and expected transaction, equality by default.
+            batch: receive transactions by the batch callback of the monitor (e.g. MVBMonitor in the batch mode).
+
+        Returns:
+            Interface, to which the expected transactions are appended.
+        """
+        interface = ScoreboardInterface(self, str(monitor), key, window, compare)
+        self.interfaces.append(interface)
+
+        if batch:
+            monitor.add_batch_callback(interface.received_batch)
+        else:
+            monitor.add_callback(interface.received)
+        return interface
+
+    def _error(self, interface, kind, expected, received) -> None:
+        self.errors += 1
+
+        if self._file:
+            record = {"time": get_sim_time(self.time_units), "interface": interface.name, "kind": kind}
+            if expected is not None:
+                record["expected"] = _format(expected)
+            if received is not None:
+                record["received"] = _format(received)
+            self._file.write(json.dumps(record) + "\n")
+
+        if self.errors <= self._max_logged:
+            self.log.error(f"{interface.name}: {kind} transaction, expected: {_format(expected)}, received: {_format(received)}")
+        elif self.errors == self._max_logged + 1:
+            self.log.error("Too many errors, further errors are not logged")
+
+        if self._imm:
+            assert False, f"{kind} transaction on {interface.name}"
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @property
+    def result(self):
+        """Logs summary of all interfaces and determines the test result.
+
+        Raises:
+            AssertionError: If not all expected output was received or errors were recorded during the test.
+        """
+        for interface in self.interfaces:
+            self.log.info(interface.summary())
+        self.close()
+
+        pending = sum(len(interface) for interface in self.interfaces)
+        assert not pending, f"Still expecting {pending} transactions"
+        assert not self.errors, "Errors were recorded during the test"
+        return test_success()